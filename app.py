@@ -0,0 +1,25 @@
+"""ASGI entrypoint that serves ui.py with the config and Google service warmed up before the first session."""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from streamlit.starlette import App
+from calendar_service import authenticate_google
+from utils import load_yaml
+
+CONFIG_PATH = "config.yaml"
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Parse config.yaml and build the Google service from a saved token at startup."""
+    if os.path.exists(CONFIG_PATH):
+        load_yaml(CONFIG_PATH)
+    # Only warm up from a usable token; sign-in never runs at startup and still happens from the UI
+    try:
+        await asyncio.to_thread(authenticate_google, False)
+    except Exception as e:
+        print(f"Skipping Google service warm-up: {e}")
+    yield
+
+
+app = App("ui.py", lifespan=lifespan)
@@ -1,76 +1,448 @@
+import json
 import os
-import pickle
-from datetime import datetime, timedelta
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import httplib2
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 
 # Google Calendar API configuration
 SCOPES = ['https://www.googleapis.com/auth/calendar']
-TOKEN_PATH = 'token.pickle'
+TOKEN_PATH = 'token.json'
+LEGACY_TOKEN_PATH = 'token.pickle'
 CREDENTIALS_PATH = 'credentials.json'
 
-def authenticate_google():
-    """Authenticate with Google Calendar API and return the service object."""
-    creds = None
-    if os.path.exists(TOKEN_PATH):
-        with open(TOKEN_PATH, 'rb') as token:
+# Batch request configuration (the Calendar API accepts up to 50 calls per batch)
+BATCH_SIZE = 50
+MAX_RETRIES = 5
+
+# A single freeBusy query accepts up to 50 calendars
+FREEBUSY_MAX_CALENDARS = 50
+
+# Refresh the access token only when it expires within this many seconds
+TOKEN_REFRESH_MARGIN = 60
+
+# Request bodies are encoded without insignificant whitespace
+_ENCODE_JSON = json.JSONEncoder(separators=(',', ':')).encode
+
+class _CompactJsonModel(JsonModel):
+    """JSON model that reuses a single compact encoder for request bodies."""
+
+    def request(self, headers, path_params, query_params, body_value, api_version=None):
+        # The base model adds "(gzip)" to this and asks for gzip-compressed responses
+        headers.setdefault('user-agent', 'gcal-scheduler')
+        return super().request(headers, path_params, query_params, body_value, api_version)
+
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        return _ENCODE_JSON(body_value)
+
+# Cached credentials and calendar summary -> ID index
+_CREDS_CACHE = None
+_CAL_INDEX = {}
+
+# Per-thread HTTP transports and services; httplib2.Http is not thread-safe, so Streamlit
+# sessions and worker threads each get their own, reused for keep-alive within the thread
+_THREAD_LOCAL = threading.local()
+
+# Calendar ID -> ((start, end) UTC range that was listed, {(summary, start, end) key: event})
+# for events already in that calendar; a None bound means the range is open on that side
+_SEEN_EVENTS = {}
+
+def clear_service_cache():
+    """Forget the cached credentials and calendar index (e.g. after re-authenticating)."""
+    global _CREDS_CACHE
+    _CREDS_CACHE = None
+    _CAL_INDEX.clear()
+    _SEEN_EVENTS.clear()
+
+def _build_service(creds, http):
+    """Build a Calendar service that sends requests through the given HTTP transport."""
+    # Use the discovery document bundled with google-api-python-client rather than fetching it,
+    # without first probing for a discovery cache that would never be used
+    return build('calendar', 'v3', http=AuthorizedHttp(creds, http=http), model=_CompactJsonModel(data_wrapper=False),
+                 static_discovery=True, cache_discovery=False)
+
+def _clone_service(creds):
+    """Get a service owned by the current thread, with its own HTTP connection."""
+    cached = getattr(_THREAD_LOCAL, 'service', None)
+    if cached is None or cached[0] is not creds:
+        http = getattr(_THREAD_LOCAL, 'http', None)
+        if http is None:
+            http = _THREAD_LOCAL.http = httplib2.Http()
+        cached = (creds, _build_service(creds, http))
+        _THREAD_LOCAL.service = cached
+    return cached[1]
+
+def _needs_refresh(creds):
+    """Check if the credentials have no access token or it is about to expire."""
+    if not creds.token:
+        return True
+    if creds.expiry is None:
+        return False
+    # google-auth stores expiry as a naive UTC datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (creds.expiry - now).total_seconds() < TOKEN_REFRESH_MARGIN
+
+def _read_token():
+    """Load the saved credentials from the JSON token file, or None if there is none."""
+    try:
+        with open(TOKEN_PATH, 'r') as token:
+            return Credentials.from_authorized_user_info(json.load(token), SCOPES)
+    except FileNotFoundError:
+        return None
+
+def _migrate_legacy_token():
+    """Convert a pickled token from older versions into the JSON token file, returning the credentials."""
+    import pickle
+    try:
+        with open(LEGACY_TOKEN_PATH, 'rb') as token:
             creds = pickle.load(token)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open(TOKEN_PATH, 'wb') as token:
-            pickle.dump(creds, token)
-    service = build('calendar', 'v3', credentials=creds)
-    return service
+    except FileNotFoundError:
+        return None
+    with open(TOKEN_PATH, 'w') as token:
+        token.write(creds.to_json())
+    os.remove(LEGACY_TOKEN_PATH)
+    return _read_token()
+
+def authenticate_google(interactive=True):
+    """Authenticate with Google Calendar API and return the service object.
+
+    With `interactive` false, return None instead of starting the browser sign-in
+    when there is no token or it can't be refreshed.
+    """
+    global _CREDS_CACHE
+    if _CREDS_CACHE is not None and not _needs_refresh(_CREDS_CACHE):
+        return _clone_service(_CREDS_CACHE)
+    creds = _read_token() or _migrate_legacy_token()
+    # Only hit the network when there is no usable token
+    old_token = creds.token if creds else None
+    if creds is None or (_needs_refresh(creds) and not creds.refresh_token):
+        if not interactive:
+            return None
+        flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
+        creds = flow.run_local_server(port=0)
+    elif _needs_refresh(creds):
+        creds.refresh(Request())
+    if creds.token != old_token:
+        with open(TOKEN_PATH, 'w') as token:
+            token.write(creds.to_json())
+    _CREDS_CACHE = creds
+    _CAL_INDEX.clear()
+    return _clone_service(creds)
+
+def _iter_calendars(service):
+    """Yield the id and summary of every calendar in the user's calendar list."""
+    page_token = None
+    while True:
+        result = service.calendarList().list(
+            fields='items(id,summary),nextPageToken',
+            pageToken=page_token
+        ).execute()
+        yield from result.get('items', [])
+        page_token = result.get('nextPageToken')
+        if not page_token:
+            break
 
 def list_calendars(service):
     """List all calendars accessible to the authenticated user."""
-    calendars = service.calendarList().list().execute()
-    for cal in calendars.get('items', []):
+    for cal in _iter_calendars(service):
+        _CAL_INDEX.setdefault(cal['summary'], cal['id'])
         print(f"{cal['summary']} (ID: {cal['id']})")
 
+def _events_list_request(service, calendar_id, time_min, time_max, fields, page_token=None):
+    """Build an events.list request for one page of a calendar's events."""
+    return service.events().list(
+        calendarId=calendar_id,
+        timeMin=time_min,
+        timeMax=time_max,
+        singleEvents=True,
+        orderBy='startTime',
+        fields=fields,
+        maxResults=2500,
+        pageToken=page_token
+    )
+
+def iter_events(service, calendar_id, time_min=None, time_max=None,
+                fields='items(start(dateTime,date),summary),nextPageToken', page_token=None):
+    """Yield events from a calendar one page at a time, following nextPageToken."""
+    while True:
+        events_result = _events_list_request(service, calendar_id, time_min, time_max, fields, page_token).execute()
+        yield from events_result.get('items', [])
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            break
+
+def _map_threaded(service, fn, calls, workers=8):
+    """Run fn(service, *args) for each args tuple, on worker threads with their own services if more than one."""
+    # Workers build their services from the credentials authenticate_google cached
+    creds = _CREDS_CACHE
+    if len(calls) <= 1 or creds is None:
+        return [fn(service, *args) for args in calls]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda args: fn(_clone_service(creds), *args), calls))
+
+def _query_free_busy(service, calendar_ids, time_min, time_max):
+    """Run one freeBusy query and return its per-calendar results."""
+    result = service.freebusy().query(body={
+        'timeMin': time_min,
+        'timeMax': time_max,
+        'items': [{'id': calendar_id} for calendar_id in calendar_ids]
+    }).execute()
+    return result.get('calendars', {})
+
+def _busy_pairs(events):
+    """Convert events to (start, end) pairs."""
+    return [
+        (event['start'].get('dateTime', event['start'].get('date')),
+         event['end'].get('dateTime', event['end'].get('date')))
+        for event in events
+    ]
+
+def _list_busy_batched(service, calendar_ids, time_min, time_max):
+    """List events for many calendars as (start, end) pairs, batching the first page of each."""
+    fields = 'items(start(dateTime,date),end(dateTime,date)),nextPageToken'
+    pages = [None] * len(calendar_ids)
+    errors = []
+
+    def _cb(request_id, response, exception):
+        if exception is not None:
+            errors.append(exception)
+        pages[int(request_id)] = response
+
+    for start in range(0, len(calendar_ids), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_cb)
+        for index in range(start, min(start + BATCH_SIZE, len(calendar_ids))):
+            batch.add(_events_list_request(service, calendar_ids[index], time_min, time_max, fields), request_id=str(index))
+        batch.execute()
+        if errors:
+            raise errors[0]
+    conflicts = []
+    for calendar_id, page in zip(calendar_ids, pages):
+        busy = _busy_pairs(page.get('items', []))
+        # Calendars with more than one page of events continue with plain requests
+        if page.get('nextPageToken'):
+            busy.extend(_busy_pairs(iter_events(service, calendar_id, time_min, time_max, fields, page['nextPageToken'])))
+        conflicts.append(busy)
+    return conflicts
+
+def fetch_member_conflicts_bulk(service, calendar_ids, time_min, time_max, workers=8):
+    """Fetch busy (start, end) intervals for many calendars with chunked freeBusy queries."""
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    chunks = [calendar_ids[i:i + FREEBUSY_MAX_CALENDARS]
+              for i in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS)]
+    calendars = {}
+    for result in _map_threaded(service, _query_free_busy, [(chunk, time_min, time_max) for chunk in chunks], workers):
+        calendars.update(result)
+    conflicts = {}
+    unreadable = []
+    for calendar_id in calendar_ids:
+        entry = calendars.get(calendar_id)
+        if entry is not None and not entry.get('errors'):
+            conflicts[calendar_id] = [(busy['start'], busy['end']) for busy in entry.get('busy', [])]
+        else:
+            unreadable.append(calendar_id)
+    # freeBusy could not read these calendars; list their events instead
+    if unreadable:
+        conflicts.update(zip(unreadable, _list_busy_batched(service, unreadable, time_min, time_max)))
+    return conflicts
+
 def list_events(service, calendar_id, days=7):
     """List events from a calendar for the specified number of days."""
-    now = datetime.utcnow().isoformat() + 'Z'
-    future = (datetime.utcnow() + timedelta(days=days)).isoformat() + 'Z'
-    events_result = service.events().list(calendarId=calendar_id, timeMin=now, timeMax=future, singleEvents=True, orderBy='startTime').execute()
-    events = events_result.get('items', [])
-    if not events:
-        print('No upcoming events found.')
-    for event in events:
-        start = event['start'].get('dateTime', event['start'].get('date'))
+    now_dt = datetime.now(timezone.utc)
+    now = now_dt.isoformat(timespec='seconds').replace('+00:00', 'Z')
+    future = (now_dt + timedelta(days=days)).isoformat(timespec='seconds').replace('+00:00', 'Z')
+    found = False
+    for event in iter_events(service, calendar_id, now, future):
+        found = True
+        event_start = event['start']
+        start = event_start.get('dateTime', event_start.get('date'))
         print(f"{start}: {event['summary']}")
+    if not found:
+        print('No upcoming events found.')
+
+def _index_calendars(service):
+    """Populate the calendar index from the user's calendar list."""
+    for cal in _iter_calendars(service):
+        _CAL_INDEX.setdefault(cal['summary'], cal['id'])
 
 def get_or_create_calendar(service, calendar_name):
     """Get an existing calendar by name or create a new one."""
-    # Check if calendar exists
-    calendars = service.calendarList().list().execute()
-    for cal in calendars.get('items', []):
-        if cal['summary'] == calendar_name:
-            return cal['id']
+    # Check cached calendars first, then refresh the index from the API
+    if calendar_name in _CAL_INDEX:
+        return _CAL_INDEX[calendar_name]
+    _index_calendars(service)
+    if calendar_name in _CAL_INDEX:
+        return _CAL_INDEX[calendar_name]
     # Create new calendar
     calendar = {
         'summary': calendar_name,
         'timeZone': 'UTC',
     }
     created = service.calendars().insert(body=calendar).execute()
+    _CAL_INDEX[calendar_name] = created['id']
+    _SEEN_EVENTS[created['id']] = ((None, None), {})
     return created['id']
 
-def create_event(service, calendar_id, summary, start_time, end_time, attendees=None, description=None, location=None):
-    """Create a new event in the specified calendar."""
+def _event_key(summary, start_time, end_time):
+    """Build a comparable key for an event from its summary and UTC start/end times."""
+    def _utc(value):
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+    return (summary, _utc(start_time), _utc(end_time))
+
+def _rfc3339(dt):
+    """Format a UTC datetime as the RFC 3339 string the Calendar API expects."""
+    return dt.isoformat().replace('+00:00', 'Z')
+
+def _seen_events(service, calendar_id, keys):
+    """Get the events already in a calendar by key, listing only the time span of `keys` if it isn't covered yet."""
+    time_min = min(key[1] for key in keys)
+    time_max = max(key[2] for key in keys)
+    listed = None
+    seen = {}
+    if calendar_id in _SEEN_EVENTS:
+        listed, seen = _SEEN_EVENTS[calendar_id]
+        listed_min, listed_max = listed
+        if (listed_min is None or listed_min <= time_min) and (listed_max is None or time_max <= listed_max):
+            return seen
+    fields = 'items(id,htmlLink,summary,description,location,start(dateTime),end(dateTime)),nextPageToken'
+    for event in iter_events(service, calendar_id, _rfc3339(time_min), _rfc3339(time_max), fields):
+        start = event.get('start', {}).get('dateTime')
+        end = event.get('end', {}).get('dateTime')
+        if start and end:
+            seen.setdefault(_event_key(event.get('summary', ''), start, end), event)
+    # Extend the listed range when the new one touches it; otherwise track just the new one
+    if listed is not None and listed_min <= time_max and time_min <= listed_max:
+        time_min, time_max = min(time_min, listed_min), max(time_max, listed_max)
+    _SEEN_EVENTS[calendar_id] = ((time_min, time_max), seen)
+    return seen
+
+def _attendee(email):
+    """Build an attendee entry, interning the address since the same people recur across events."""
+    return {'email': sys.intern(email)}
+
+def _build_event(summary, start_time, end_time, attendees=None, description=None, location=None):
+    """Build the request body for a new event."""
     event = {
         'summary': summary,
         'start': {'dateTime': start_time, 'timeZone': 'UTC'},
         'end': {'dateTime': end_time, 'timeZone': 'UTC'},
     }
     if attendees:
-        event['attendees'] = [{'email': email} for email in attendees]
+        event['attendees'] = list(map(_attendee, attendees))
     if description:
         event['description'] = description
     if location:
         event['location'] = location
-    service.events().insert(calendarId=calendar_id, body=event).execute() 
\ No newline at end of file
+    return event
+
+def _event_changes(existing, body):
+    """Get the description and location values in `body` that differ from an existing event."""
+    return {field: body.get(field, '') for field in ('description', 'location')
+            if existing.get(field, '') != body.get(field, '')}
+
+def _is_rate_limited(exception):
+    """Check if an API error is a rate limit error that should be retried."""
+    if not isinstance(exception, HttpError):
+        return False
+    if exception.resp.status == 429:
+        return True
+    return exception.resp.status == 403 and b'ratelimitexceeded' in (exception.content or b'').lower()
+
+def create_events_bulk(service, calendar_id, events):
+    """Create multiple events in the specified calendar using batched requests.
+
+    Each item in `events` is a dict of `create_event` keyword arguments. Returns a
+    list aligned with `events` of (status, result) pairs. Status 'created' holds the
+    new event and 'failed' the exception raised. Events already in the calendar
+    aren't inserted again: 'unchanged' holds the existing event, and 'updated' the
+    existing event after patching a description or location that differed. An
+    event repeated within `events` gets 'repeated' with its first copy's event, or
+    that copy's 'failed' pair if it couldn't be saved.
+    """
+    if not events:
+        return []
+    bodies = [_build_event(**event) for event in events]
+    results = [None] * len(bodies)
+    keys = [_event_key(event['summary'], event['start_time'], event['end_time']) for event in events]
+    seen = _seen_events(service, calendar_id, keys)
+    pending = []
+    repeats = []
+    first_index = {}
+    # Index -> (event ID, changed fields) for existing events that only need a patch
+    patches = {}
+    for index, key in enumerate(keys):
+        if key in first_index:
+            repeats.append(index)
+            continue
+        first_index[key] = index
+        if key not in seen:
+            pending.append(index)
+            continue
+        changes = _event_changes(seen[key], bodies[index])
+        if changes:
+            patches[index] = (seen[key]['id'], changes)
+            pending.append(index)
+        else:
+            results[index] = ('unchanged', seen[key])
+    delay = 1
+    for attempt in range(MAX_RETRIES + 1):
+        retry = []
+
+        def _cb(request_id, response, exception):
+            index = int(request_id)
+            if exception is not None and attempt < MAX_RETRIES and _is_rate_limited(exception):
+                retry.append(index)
+            elif exception is not None:
+                results[index] = ('failed', exception)
+            else:
+                seen[keys[index]] = response
+                results[index] = ('updated' if index in patches else 'created', response)
+
+        for start in range(0, len(pending), BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_cb)
+            for index in pending[start:start + BATCH_SIZE]:
+                if index in patches:
+                    event_id, changes = patches[index]
+                    request = service.events().patch(calendarId=calendar_id, eventId=event_id, body=changes)
+                else:
+                    request = service.events().insert(calendarId=calendar_id, body=bodies[index])
+                batch.add(request, request_id=str(index))
+            batch.execute()
+        if not retry:
+            break
+        # Exponential backoff before resubmitting rate-limited requests
+        time.sleep(delay)
+        delay *= 2
+        pending = sorted(retry)
+    for index in repeats:
+        status, result = results[first_index[keys[index]]]
+        results[index] = (status, result) if status == 'failed' else ('repeated', result)
+    return results
+
+def create_event(service, calendar_id, summary, start_time, end_time, attendees=None, description=None, location=None):
+    """Create a new event in the specified calendar."""
+    event = {
+        'summary': summary,
+        'start_time': start_time,
+        'end_time': end_time,
+        'attendees': attendees,
+        'description': description,
+        'location': location,
+    }
+    status, result = create_events_bulk(service, calendar_id, [event])[0]
+    if status == 'failed':
+        raise result
+    return result
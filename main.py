@@ -1,84 +1,125 @@
 import argparse
-import json
 import os
 import re
-import uuid
-from collections import defaultdict
-from datetime import datetime
-import pytz
-import yaml
-from pysat.card import CardEnc
-from pysat.examples.rc2 import RC2
-from pysat.formula import IDPool, WCNF
-from pysat.solvers import Glucose3
-
-from calendar_service import (
-    authenticate_google, create_event, get_or_create_calendar, 
-    list_calendars, list_events
-)
-from models import Member, Meeting
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from models import Member, Meeting, Slot
 from utils import (
-    add_member, add_meeting, add_potential_time, fetch_member_conflicts,
-    fetch_potential_times_from_calendar, generate_possible_slots, get_potential_times_calendar,
-    get_timezone, list_meetings, list_members, list_potential_times, load_json,
-    overlaps, remove_meeting, remove_member, remove_potential_time,
-    set_potential_times_calendar, set_timezone
+    add_member, add_meeting, add_potential_time,
+    fetch_potential_times_from_calendar, generate_id, generate_possible_slots, get_potential_times_calendar,
+    get_timezone, list_meetings, list_members, list_potential_times, load_json, load_yaml,
+    free_slot_indices, overlap_cliques, remove_meeting, remove_member, remove_potential_time, save_json,
+    set_potential_times_calendar, set_timezone, to_epoch
 )
 
-def main():
-    """Main entry point for the gcal-scheduler CLI application."""
-    # Configure pysat data directory
-    import pysat
-    pysat.params['data_dirs'] = os.path.join(os.getcwd(), 'pysatData')
-    
-    parser = argparse.ArgumentParser(description='gcal-scheduler CLI')
-    subparsers = parser.add_subparsers(dest='command')
+# ===== Date Range Parsing =====
 
-    # ===== Google Calendar Commands =====
-    parser_auth = subparsers.add_parser('auth', help='Authenticate with Google Calendar')
-    parser_list_cal = subparsers.add_parser('list-calendars', help='List all calendars')
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+@lru_cache(maxsize=32)
+def _tz(tz_name):
+    """Get a timezone by name, built once."""
+    return ZoneInfo(tz_name)
+
+def _localize(dt, tz):
+    """Attach tz to a naive datetime, picking standard time for ambiguous wall times as pytz's localize did."""
+    dt = dt.replace(tzinfo=tz)
+    if dt.dst() and not dt.replace(fold=1).dst():
+        return dt.replace(fold=1)
+    return dt
+
+def to_utc_iso(dt_str, is_start, tz_name):
+    """Convert YYYY-MM-DD (start or end of that day) or ISO input in the user's timezone to a UTC ISO string."""
+    tz = _tz(tz_name)
+    if _DATE_RE.match(dt_str):
+        dt = datetime.strptime(dt_str, '%Y-%m-%d')
+        if is_start:
+            dt = _localize(dt.replace(hour=0, minute=0, second=0), tz)
+        else:
+            dt = _localize(dt.replace(hour=23, minute=59, second=59), tz)
+        return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+    # If already ISO, try to parse and convert
+    try:
+        dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = _localize(dt, tz)
+        return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+    except Exception:
+        return dt_str
+
+# ===== Subcommand Parsers =====
+
+def _build_auth(subparsers):
+    subparsers.add_parser('auth', help='Authenticate with Google Calendar')
+
+def _build_list_calendars(subparsers):
+    subparsers.add_parser('list-calendars', help='List all calendars')
+
+def _build_list_events(subparsers):
     parser_list_events = subparsers.add_parser('list-events', help='List events for a calendar')
     parser_list_events.add_argument('calendar_id', type=str, help='Calendar ID')
 
-    # ===== Member Management Commands =====
+def _build_add_member(subparsers):
     parser_add_member = subparsers.add_parser('add-member', help='Add a member')
     parser_add_member.add_argument('name', type=str, help='Member name')
     parser_add_member.add_argument('calendar_id', type=str, help='Google Calendar ID')
-    parser_list_members = subparsers.add_parser('list-members', help='List all members')
+
+def _build_list_members(subparsers):
+    subparsers.add_parser('list-members', help='List all members')
+
+def _build_remove_member(subparsers):
     parser_remove_member = subparsers.add_parser('remove-member', help='Remove a member')
     parser_remove_member.add_argument('member_id', type=str, help='Member ID')
 
-    # ===== Meeting Management Commands =====
+def _build_add_meeting(subparsers):
     parser_add_meeting = subparsers.add_parser('add-meeting', help='Add a meeting')
     parser_add_meeting.add_argument('name', type=str, help='Meeting name')
     parser_add_meeting.add_argument('member_ids', nargs='+', help='Member IDs')
     parser_add_meeting.add_argument('--duration', type=int, default=60, help='Duration in minutes')
-    parser_list_meetings = subparsers.add_parser('list-meetings', help='List all meetings')
+
+def _build_list_meetings(subparsers):
+    subparsers.add_parser('list-meetings', help='List all meetings')
+
+def _build_remove_meeting(subparsers):
     parser_remove_meeting = subparsers.add_parser('remove-meeting', help='Remove a meeting')
     parser_remove_meeting.add_argument('meeting_id', type=str, help='Meeting ID')
 
-    # ===== Potential Meeting Time Management =====
+def _build_add_potential_time(subparsers):
     parser_add_time = subparsers.add_parser('add-potential-time', help='Add a potential meeting time')
     parser_add_time.add_argument('start_time', type=str, help='Start time (ISO format)')
     parser_add_time.add_argument('end_time', type=str, help='End time (ISO format)')
-    parser_list_times = subparsers.add_parser('list-potential-times', help='List all potential meeting times')
+
+def _build_list_potential_times(subparsers):
+    subparsers.add_parser('list-potential-times', help='List all potential meeting times')
+
+def _build_remove_potential_time(subparsers):
     parser_remove_time = subparsers.add_parser('remove-potential-time', help='Remove a potential meeting time')
     parser_remove_time.add_argument('time_id', type=str, help='Potential time ID')
 
-    # ===== Calendar Configuration Commands =====
+def _build_set_potential_times_calendar(subparsers):
     parser_set_cal = subparsers.add_parser('set-potential-times-calendar', help='Set the potential meeting times calendar ID')
     parser_set_cal.add_argument('calendar_id', type=str, help='Calendar ID')
-    parser_show_cal = subparsers.add_parser('show-potential-times-calendar', help='Show the current potential meeting times calendar ID')
+
+def _build_show_potential_times_calendar(subparsers):
+    subparsers.add_parser('show-potential-times-calendar', help='Show the current potential meeting times calendar ID')
+
+def _build_fetch_potential_times(subparsers):
     parser_fetch_times = subparsers.add_parser('fetch-potential-times', help='Fetch and list potential meeting times from the calendar for a given week')
     parser_fetch_times.add_argument('week_start', type=str, help='Week start (ISO format)')
     parser_fetch_times.add_argument('week_end', type=str, help='Week end (ISO format)')
 
-    # ===== Timezone Management =====
+def _build_set_timezone(subparsers):
     parser_set_tz = subparsers.add_parser('set-timezone', help='Set the default timezone (e.g., America/New_York)')
     parser_set_tz.add_argument('timezone', type=str, help='Timezone name')
-    parser_show_tz = subparsers.add_parser('show-timezone', help='Show the current default timezone')
 
-    # ===== Scheduling Commands =====
+def _build_show_timezone(subparsers):
+    subparsers.add_parser('show-timezone', help='Show the current default timezone')
+
+def _build_schedule_meetings(subparsers):
     parser_schedule = subparsers.add_parser('schedule-meetings', help='Schedule meetings for the given week')
     parser_schedule.add_argument('week_start', type=str, help='Week start (YYYY-MM-DD or ISO)')
     parser_schedule.add_argument('week_end', type=str, help='Week end (YYYY-MM-DD or ISO)')
@@ -86,20 +127,502 @@ def main():
     parser_schedule.add_argument('--penalty-key-attendee-absence', type=int, default=None, help='Penalty for key attendee absence (overrides config)')
     parser_schedule.add_argument('--penalty-required-member-absence', type=int, default=None, help='Penalty for required member absence (overrides config)')
     parser_schedule.add_argument('--penalty-key-meeting-absence', type=int, default=None, help='Penalty for key meeting absence (overrides config)')
+    parser_schedule.add_argument('--rc2-config', choices=['A', 'B', 'off'], default='B', help='RC2 MaxSAT solver configuration: MSE 2018 preset A or B, or off for plain RC2 (default: B)')
 
-    # ===== Configuration Commands =====
+def _build_load_config(subparsers):
     parser_load_config = subparsers.add_parser('load-config', help='Load members, meetings, and potential times calendar from a YAML config file')
     parser_load_config.add_argument('config_file', type=str, help='YAML config file path')
+
+def _build_add_constraint(subparsers):
     parser_add_constraint = subparsers.add_parser('add-constraint', help='Add a fixed constraint that mandates members must attend a meeting')
     parser_add_constraint.add_argument('meeting', type=str, help='Meeting name')
     parser_add_constraint.add_argument('members', nargs='+', help='Member name(s)')
+
+def _build_set_active_meetings(subparsers):
     parser_set_active_meetings = subparsers.add_parser('set-active-meetings', help='Set the list of active meetings to schedule')
     parser_set_active_meetings.add_argument('meeting_names', nargs='+', help='Names of meetings to schedule')
 
+# Subcommand name -> parser builder, in help order
+SUBPARSER_BUILDERS = {
+    'auth': _build_auth,
+    'list-calendars': _build_list_calendars,
+    'list-events': _build_list_events,
+    'add-member': _build_add_member,
+    'list-members': _build_list_members,
+    'remove-member': _build_remove_member,
+    'add-meeting': _build_add_meeting,
+    'list-meetings': _build_list_meetings,
+    'remove-meeting': _build_remove_meeting,
+    'add-potential-time': _build_add_potential_time,
+    'list-potential-times': _build_list_potential_times,
+    'remove-potential-time': _build_remove_potential_time,
+    'set-potential-times-calendar': _build_set_potential_times_calendar,
+    'show-potential-times-calendar': _build_show_potential_times_calendar,
+    'fetch-potential-times': _build_fetch_potential_times,
+    'set-timezone': _build_set_timezone,
+    'show-timezone': _build_show_timezone,
+    'schedule-meetings': _build_schedule_meetings,
+    'load-config': _build_load_config,
+    'add-constraint': _build_add_constraint,
+    'set-active-meetings': _build_set_active_meetings,
+}
+
+# ===== MaxSAT Solver =====
+
+# Above this many soft clauses AtMost1 detection costs more memory than it saves
+RC2_ADAPT_LIMIT = 50000
+
+def _make_rc2(wcnf, config='B'):
+    """Create an RC2 solver using one of the MaxSAT Evaluation 2018 presets ('A', 'B') or plain RC2 ('off')."""
+    from pysat.examples.rc2 import RC2, RC2Stratified
+    if config == 'off':
+        return RC2(wcnf)
+    weighted = bool(wcnf.wght) and max(wcnf.wght) > min(wcnf.wght)
+    options = {'solver': 'g3', 'adapt': True, 'exhaust': True, 'incr': False}
+    if config == 'A':
+        options.update(trim=5 if weighted else 0, minz=False)
+    else:
+        options.update(trim=0, minz=True)
+    blo = 'div'
+    if len(wcnf.soft) > RC2_ADAPT_LIMIT:
+        options['adapt'] = False
+        blo = 'cluster'
+    if weighted:
+        return RC2Stratified(wcnf, blo=blo, **options)
+    return RC2(wcnf, **options)
+
+def _solve_external(wcnf, command):
+    """Solve with an external MaxSAT solver that reads a WCNF file; return its model, or None if unsatisfiable."""
+    import shlex
+    import subprocess
+    import tempfile
+    if isinstance(command, str):
+        command = shlex.split(command)
+    fd, path = tempfile.mkstemp(suffix='.wcnf')
+    os.close(fd)
+    try:
+        wcnf.to_file(path)
+        result = subprocess.run(list(command) + [path], capture_output=True, text=True)
+    finally:
+        os.remove(path)
+    status = None
+    values = []
+    for line in result.stdout.splitlines():
+        if line.startswith('s '):
+            status = line[2:].strip()
+        elif line.startswith('v '):
+            values.extend(line[2:].split())
+    if status == 'UNSATISFIABLE':
+        return None
+    if status != 'OPTIMUM FOUND' or not values:
+        raise RuntimeError(f"no optimum in solver output (exit code {result.returncode})")
+    # Solvers following the MaxSAT Evaluation 2020+ format print one string of 0/1 digits
+    if len(values) == 1 and len(values[0]) > 1 and set(values[0]) <= {'0', '1'}:
+        return [i if bit == '1' else -i for i, bit in enumerate(values[0], 1)]
+    return [int(lit) for lit in values if lit != '0']
+
+def _solve(wcnf, rc2_config, external=None):
+    """Solve the formula with the configured external MaxSAT solver, falling back to RC2."""
+    if external:
+        try:
+            return _solve_external(wcnf, external)
+        except (OSError, RuntimeError) as e:
+            print(f"Warning: external MaxSAT solver failed ({e}); falling back to RC2")
+    with _make_rc2(wcnf, rc2_config) as rc2:
+        return rc2.compute()
+
+# Cardinality constraints over more literals than this use a sequential counter
+PAIRWISE_MAX_LITS = 5
+
+def _card_encoding(lits):
+    """Pick the pairwise encoding for small cardinality constraints and a sequential counter otherwise."""
+    from pysat.card import EncType
+    return EncType.seqcounter if len(lits) > PAIRWISE_MAX_LITS else EncType.pairwise
+
+def _popcount(mask):
+    """Count the set bits in a member bitmask."""
+    return bin(mask).count('1')
+
+def _member_mask(member_ids, member_bits):
+    """Combine members into one bitmask; also return how many have no bit (and so are never available)."""
+    mask = 0
+    unknown = 0
+    for member_id in set(member_ids):
+        bit = member_bits.get(member_id)
+        if bit is None:
+            unknown += 1
+        else:
+            mask |= bit
+    return mask, unknown
+
+def _at_most_one(lits, vpool):
+    """Encode that at most one of `lits` is true; no clauses are needed for fewer than two."""
+    from pysat.card import CardEnc
+    if len(lits) < 2:
+        return []
+    return CardEnc.atmost(lits=lits, bound=1, vpool=vpool, encoding=_card_encoding(lits)).clauses
+
+def _encode_schedule(meetings, slots, slot_availability, member_bits, key_member_ids, key_meetings, penalties):
+    """Encode the scheduling problem as weighted MaxSAT and return (wcnf, var_map).
+
+    `slot_availability` maps slot IDs to bitmasks of available members, using the
+    bit for each member ID given by `member_bits`.
+    """
+    from pysat.formula import IDPool, WCNF
+    # Number the (meeting, slot) variables directly and keep each meeting's
+    # (slot ID, variable) pairs in a list indexed like `meetings`
+    var_map = {}
+    vars_by_meeting = []
+    vars_by_slot = defaultdict(list)
+    for meeting in meetings:
+        pairs = []
+        for slot in slots:
+            var = len(var_map) + 1
+            var_map[(meeting['id'], slot.slot_id)] = var
+            vars_by_slot[slot.slot_id].append(var)
+            pairs.append((slot.slot_id, var))
+        vars_by_meeting.append(pairs)
+    # Auxiliary variables of the cardinality encodings are numbered after them
+    vpool = IDPool(start_from=len(var_map) + 1)
+    meeting_index = {meeting['id']: i for i, meeting in enumerate(meetings)}
+    # Clauses are collected in plain lists and added to the formula in one go.
+    # Every soft clause is a unit [-v], so penalties are summed per variable;
+    # zero weights carry no penalty, so those soft clauses are left out
+    hard = []
+    penalty = defaultdict(int)
+    penalties = {name: max(weight, 0) for name, weight in penalties.items()}
+    # 1. Each meeting is scheduled exactly once (hard)
+    for pairs in vars_by_meeting:
+        vars_for_meeting = [var for _, var in pairs]
+        if vars_for_meeting:  # Only add constraint if there are possible slots
+            hard.append(vars_for_meeting)
+            hard.extend(_at_most_one(vars_for_meeting, vpool))
+    # 1b. Key attendees constraints (soft, high penalty): penalize each (meeting, slot)
+    # by the number of key attendees who can't attend the meeting in that slot
+    for meeting_id, key_ids in key_member_ids.items():
+        if meeting_id not in meeting_index:
+            continue
+        key_mask, key_unknown = _member_mask(key_ids, member_bits)
+        for slot_id, v in vars_by_meeting[meeting_index[meeting_id]]:
+            missing_count = _popcount(key_mask & ~slot_availability[slot_id]) + key_unknown
+            penalty[v] += missing_count * penalties['key_attendee_absence']
+    # 2. At most one meeting across any set of mutually overlapping slots
+    # from the same window/event (hard); a lone slot is a trivial clique
+    slots_by_window = defaultdict(list)
+    for slot in slots:
+        slots_by_window[slot.window_id].append((slot.start_epoch, slot.end_epoch, slot.slot_id))
+    for window_slots in slots_by_window.values():
+        window_clauses = []
+        for clique in overlap_cliques(window_slots):
+            lits = [var for slot_id in clique for var in vars_by_slot[slot_id]]
+            window_clauses.extend(_at_most_one(lits, vpool))
+        hard.extend(window_clauses)
+    # 3. Meetings only scheduled in slots where all required members are available (soft)
+    # 3b. Key meetings: additionally penalize each member who misses a key meeting
+    # Both penalize each (meeting, slot) by the number of missing members
+    for meeting, pairs in zip(meetings, vars_by_meeting):
+        required_mask, required_unknown = _member_mask(meeting['members'], member_bits)
+        is_key_meeting = meeting['name'] in key_meetings
+        for slot_id, v in pairs:
+            missing_count = _popcount(required_mask & ~slot_availability[slot_id]) + required_unknown
+            if not missing_count:
+                continue
+            penalty[v] += missing_count * penalties['required_member_absence']
+            if is_key_meeting:
+                penalty[v] += missing_count * penalties['key_meeting_absence']
+    soft = [[-v] for v, weight in penalty.items() if weight > 0]
+    weights = [weight for weight in penalty.values() if weight > 0]
+    wcnf = WCNF()
+    wcnf.hard.extend(hard)
+    wcnf.soft.extend(soft)
+    wcnf.wght.extend(weights)
+    # Keep the bookkeeping append() would have done; RC2 numbers its own variables above nv
+    wcnf.nv = max(wcnf.nv, vpool.top)
+    wcnf.topw += sum(weights)
+    return wcnf, var_map
+
+# ===== Scheduling =====
+
+# How each create_events_bulk status is counted in the save report
+_SAVE_STATUS_LABELS = (
+    ('created', 'created'),
+    ('updated', 'updated'),
+    ('unchanged', 'already in the calendar'),
+    ('repeated', 'repeated in the schedule'),
+    ('failed', 'failed'),
+)
+
+def schedule_meetings(args):
+    """Solve the schedule for the given date range, print it, and optionally save it to a calendar."""
+    # Heavy solver and API imports are only paid for when scheduling
+    import pysat
+    from calendar_service import (
+        authenticate_google, create_events_bulk, fetch_member_conflicts_bulk, get_or_create_calendar
+    )
+    # Configure pysat data directory
+    pysat.params['data_dirs'] = os.path.join(os.getcwd(), 'pysatData')
+    # Load penalties from config if available
+    penalties = {
+        'key_attendee_absence': 100,
+        'required_member_absence': 1,
+        'key_meeting_absence': 5
+    }
+    config_path = 'data/config.json'
+    config_json = load_json(config_path, {})
+    if 'penalties' in config_json:
+        penalties.update({k: v for k, v in config_json['penalties'].items() if v is not None})
+    # Override with CLI if provided
+    if args.penalty_key_attendee_absence is not None:
+        penalties['key_attendee_absence'] = args.penalty_key_attendee_absence
+    if args.penalty_required_member_absence is not None:
+        penalties['required_member_absence'] = args.penalty_required_member_absence
+    if args.penalty_key_meeting_absence is not None:
+        penalties['key_meeting_absence'] = args.penalty_key_meeting_absence
+    tz_name = get_timezone()
+    week_start = to_utc_iso(args.week_start, True, tz_name)
+    week_end = to_utc_iso(args.week_end, False, tz_name)
+    # Fetch data
+    meetings = load_json('data/meetings.json')
+    # Filter meetings if active_meetings is set
+    active_meetings = load_json('data/active_meetings.json', False)
+    if active_meetings is not False:
+        active_meetings = set(active_meetings)
+        meetings = [m for m in meetings if m['name'] in active_meetings]
+    members = load_json('data/members.json')
+    service = authenticate_google()
+    slots = fetch_potential_times_from_calendar(service, week_start, week_end)
+    # Always use 60 minutes as the meeting duration
+    duration_minutes = 60
+    all_possible_slots = []
+    slot_index = 0
+    for i, window in enumerate(slots):
+        window_start = window['start_time']
+        window_end = window['end_time']
+        possible_slots = generate_possible_slots(window_start, window_end, duration_minutes)
+        for slot_start, slot_end in possible_slots:
+            all_possible_slots.append(Slot(
+                slot_id=f'slot{slot_index}',
+                start_time=slot_start,
+                end_time=slot_end,
+                start_epoch=to_epoch(slot_start),
+                end_epoch=to_epoch(slot_end),
+                location=window.get('location'),
+                window_id=i
+            ))
+            slot_index += 1
+    # Build member and meeting lookups
+    member_lookup = {m['id']: m for m in members}
+    members_by_name = {m['name']: m for m in members}
+    meetings_by_id = {m['id']: m for m in meetings}
+    meetings_by_name = {m['name']: m for m in meetings}
+    slot_map = {slot.slot_id: slot for slot in all_possible_slots}
+    # Fetch busy intervals per calendar; members sharing a calendar share its availability
+    busy_by_calendar = fetch_member_conflicts_bulk(
+        service, [member['calendar_id'] for member in members], week_start, week_end)
+    # Build availability matrix for all slots as bitmasks over member positions
+    member_bits = {m['id']: 1 << i for i, m in enumerate(members)}
+    bits_by_calendar = defaultdict(int)
+    for member in members:
+        bits_by_calendar[member['calendar_id']] |= member_bits[member['id']]
+    slot_times = [(slot.start_epoch, slot.end_epoch) for slot in all_possible_slots]
+    slot_order = sorted(range(len(slot_times)), key=lambda i: slot_times[i][0])
+    masks = [0] * len(all_possible_slots)
+    for calendar_id, bits in bits_by_calendar.items():
+        busy = [(to_epoch(start), to_epoch(end)) for start, end in busy_by_calendar.get(calendar_id, [])]
+        for i in free_slot_indices(slot_times, busy, slot_order):
+            masks[i] |= bits
+    slot_availability = {slot.slot_id: mask for slot, mask in zip(all_possible_slots, masks)}
+    # Load key_attendees constraints
+    key_attendees_path = 'data/key_attendees.json'
+    key_attendees = load_json(key_attendees_path)
+    # Filter key_attendees to only those for meetings being scheduled
+    key_attendees = [c for c in key_attendees if c['meeting'] in meetings_by_name]
+    # Load key_meetings
+    key_meetings_path = 'data/key_meetings.json'
+    key_meetings = set(load_json(key_meetings_path))
+    # Resolve key attendees to member IDs per meeting
+    key_member_ids = defaultdict(list)
+    for constraint in key_attendees:
+        meeting_name = constraint['meeting']
+        members_list = constraint['members']
+        meeting_obj = meetings_by_name.get(meeting_name)
+        if not meeting_obj:
+            print(f"Warning: Could not find meeting for key_attendees: {constraint}")
+            continue
+        meeting_id = meeting_obj['id']
+        for member_name in members_list:
+            member_obj = members_by_name.get(member_name)
+            if not member_obj:
+                print(f"Warning: Could not find member for key_attendees: {constraint}")
+                continue
+            key_member_ids[meeting_id].append(member_obj['id'])
+    if not all_possible_slots:
+        for meeting in meetings:
+            print(f"Warning: No possible slots found for meeting '{meeting['name']}' - all slots have conflicts")
+    wcnf, var_map = _encode_schedule(meetings, all_possible_slots, slot_availability, member_bits,
+                                     key_member_ids, key_meetings, penalties)
+    # Check if we have any constraints to solve
+    if not wcnf.hard:
+        print("No valid scheduling constraints found. This may happen if:")
+        print("- All meetings have conflicts in all available time slots")
+        print("- No potential meeting times are available")
+        print("- No meetings are configured")
+        return
+    model = _solve(wcnf, args.rc2_config, config_json.get('maxsat_solver'))
+    if model is not None:
+        var_to_pair = {var: pair for pair, var in var_map.items()}
+        scheduled = []
+        for v in model:
+            # Only positive literals of assignment variables map to a (meeting, slot)
+            pair = var_to_pair.get(v)
+            if pair:
+                meeting_id, slot_id = pair
+                meeting = meetings_by_id[meeting_id]
+                slot = slot_map[slot_id]
+                member_names = [member_lookup[mid]['name'] for mid in meeting['members']]
+                missing = [member_lookup[mid]['name'] for mid in meeting['members'] if not member_bits.get(mid, 0) & slot_availability[slot_id]]
+                scheduled.append({'meeting': meeting, 'slot': slot, 'missing': missing})
+        # Attendance percentage calculation
+        total_assignments = 0
+        total_present = 0
+        for item in scheduled:
+            meeting = item['meeting']
+            missing = item['missing']
+            total_assignments += len(meeting['members'])
+            total_present += len(meeting['members']) - len(missing)
+        if total_assignments > 0:
+            attendance_pct = 100.0 * total_present / total_assignments
+            print(f"\nAttendance percentage: {total_present} / {total_assignments} = {attendance_pct:.2f}%")
+        else:
+            print("\nAttendance percentage: N/A (no meetings)")
+        # Count conflicts
+        key_attendee_absences = 0
+        key_meeting_absences = 0
+        required_member_absences = 0
+        # Build lookup for key_attendees for quick access
+        key_attendees_lookup = {}
+        for c in key_attendees:
+            key_attendees_lookup.setdefault(c['meeting'], set()).update(c['members'])
+        for item in scheduled:
+            meeting = item['meeting']
+            missing = item['missing']
+            meeting_name = meeting['name']
+            required_member_absences += len(missing)
+            for m in missing:
+                # Key attendee absence
+                if meeting_name in key_attendees_lookup and m in key_attendees_lookup[meeting_name]:
+                    key_attendee_absences += 1
+                # Key meeting absence
+                if meeting_name in key_meetings:
+                    key_meeting_absences += 1
+        # Double-bookings: sweep each member's attended slots in start order
+        slots_by_member = defaultdict(list)
+        for item in scheduled:
+            meeting = item['meeting']
+            slot = item['slot']
+            for mid in meeting['members']:
+                if member_lookup[mid]['name'] not in item['missing']:
+                    slots_by_member[mid].append((slot.start_epoch, slot.end_epoch, meeting['id'], slot))
+        double_booked = set()
+        for mid, entries in slots_by_member.items():
+            entries.sort(key=lambda entry: entry[0])
+            latest = None  # entry with the latest end seen so far
+            for entry in entries:
+                if latest is not None and entry[0] < latest[1] and entry[2] != latest[2]:
+                    double_booked.add((mid, entry[3].start_time, entry[3].end_time))
+                    double_booked.add((mid, latest[3].start_time, latest[3].end_time))
+                if latest is None or entry[1] > latest[1]:
+                    latest = entry
+        print("\nConflicts:")
+        # Show detailed conflicts for each meeting
+        for item in scheduled:
+            meeting = item['meeting']
+            slot = item['slot']
+            missing = item['missing']
+            if missing:
+                print(f"  {meeting['name']}: {', '.join(missing)}")
+        # Save schedule to user-specified Google Calendar if requested
+        if args.save_calendar:
+            calendar_name = args.save_calendar
+            events = []
+            for item in scheduled:
+                meeting = item['meeting']
+                slot = item['slot']
+                missing = item['missing']
+                db_members = [member_lookup[mid]['name'] for mid in meeting['members'] if (mid, slot.start_time, slot.end_time) in double_booked]
+                description_lines = []
+                if missing:
+                    description_lines.append('Missing: ' + ', '.join(missing))
+                if db_members:
+                    description_lines.append('Double-booked: ' + ', '.join(db_members))
+                description = '\n'.join(description_lines) if description_lines else None
+                events.append({
+                    'summary': meeting['name'],
+                    'start_time': slot.start_time,
+                    'end_time': slot.end_time,
+                    'description': description,
+                    'location': slot.location,
+                })
+            # A blank line ends the conflict list before the save report
+            print()
+            try:
+                cal_id = get_or_create_calendar(service, calendar_name)
+                # Insert every event through batched requests rather than one round-trip each
+                results = create_events_bulk(service, cal_id, events)
+            except Exception as e:
+                # Lookup, listing and transport errors fail the whole save, not just one event
+                print(f"Failed to create events in {calendar_name}: {e}")
+                results = []
+            counts = Counter()
+            for item, (status, result) in zip(scheduled, results):
+                counts[status] += 1
+                if status == 'failed':
+                    print(f"Failed to create event for {item['meeting']['name']} at {item['slot'].start_time}: {result}")
+            report = [f"{counts[status]} {label}" for status, label in _SAVE_STATUS_LABELS if counts[status]]
+            if report:
+                print(f"Saving to {calendar_name}: {', '.join(report)}")
+    else:
+        print("No schedule possible (should not happen unless no slots exist).")
+
+# ===== Fast Path Commands =====
+
+def _show_potential_times_calendar():
+    cal_id = get_potential_times_calendar()
+    if cal_id:
+        print(f"Potential meeting times calendar ID: {cal_id}")
+
+def _show_timezone():
+    print(f"Default timezone: {get_timezone()}")
+
+# Argument-free commands that are run without building a parser at all
+FAST_COMMANDS = {
+    'list-members': list_members,
+    'list-meetings': list_meetings,
+    'list-potential-times': list_potential_times,
+    'show-potential-times-calendar': _show_potential_times_calendar,
+    'show-timezone': _show_timezone,
+}
+
+def main():
+    """Main entry point for the gcal-scheduler CLI application."""
+    if len(sys.argv) == 2 and sys.argv[1] in FAST_COMMANDS:
+        FAST_COMMANDS[sys.argv[1]]()
+        return
+    parser = argparse.ArgumentParser(description='gcal-scheduler CLI')
+    subparsers = parser.add_subparsers(dest='command')
+    # Only build the requested subcommand; build them all for help or unknown commands
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in SUBPARSER_BUILDERS:
+        SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in SUBPARSER_BUILDERS.values():
+            build(subparsers)
+
     args = parser.parse_args()
 
     # ===== Google Calendar Commands =====
     if args.command in ['auth', 'list-calendars', 'list-events']:
+        from calendar_service import authenticate_google, list_calendars, list_events
         service = authenticate_google()
         if args.command == 'list-calendars':
             list_calendars(service)
@@ -136,35 +659,15 @@ def main():
     elif args.command == 'set-potential-times-calendar':
         set_potential_times_calendar(args.calendar_id)
     elif args.command == 'show-potential-times-calendar':
-        cal_id = get_potential_times_calendar()
-        if cal_id:
-            print(f"Potential meeting times calendar ID: {cal_id}")
+        _show_potential_times_calendar()
     
     # ===== Timezone Management Commands =====
     elif args.command == 'set-timezone':
         set_timezone(args.timezone)
     elif args.command == 'show-timezone':
-        print(f"Default timezone: {get_timezone()}")
+        _show_timezone()
     elif args.command == 'fetch-potential-times':
-        # Accept YYYY-MM-DD or full ISO, interpret in user's timezone
-        def to_utc_iso(dt_str, is_start, tz_name):
-            date_pattern = r'^\d{4}-\d{2}-\d{2}$'
-            tz = pytz.timezone(tz_name)
-            if re.match(date_pattern, dt_str):
-                dt = datetime.strptime(dt_str, '%Y-%m-%d')
-                if is_start:
-                    dt = tz.localize(dt.replace(hour=0, minute=0, second=0))
-                else:
-                    dt = tz.localize(dt.replace(hour=23, minute=59, second=59))
-                return dt.astimezone(pytz.utc).isoformat().replace('+00:00', 'Z')
-            # If already ISO, try to parse and convert
-            try:
-                dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-                if dt.tzinfo is None:
-                    dt = tz.localize(dt)
-                return dt.astimezone(pytz.utc).isoformat().replace('+00:00', 'Z')
-            except Exception:
-                return dt_str
+        from calendar_service import authenticate_google
         tz_name = get_timezone()
         week_start = to_utc_iso(args.week_start, True, tz_name)
         week_end = to_utc_iso(args.week_end, False, tz_name)
@@ -173,351 +676,37 @@ def main():
         if not slots:
             print('No potential meeting times found in the calendar.')
         else:
-            tz = pytz.timezone(tz_name)
+            tz = _tz(tz_name)
             for slot in slots:
-                # Convert UTC to local timezone for display
+                # Convert to local timezone for display
                 try:
-                    start_dt = datetime.fromisoformat(slot['start_time'].replace('Z', '+00:00')).astimezone(tz)
-                    end_dt = datetime.fromisoformat(slot['end_time'].replace('Z', '+00:00')).astimezone(tz)
+                    start_dt = datetime.fromtimestamp(to_epoch(slot['start_time']), tz)
+                    end_dt = datetime.fromtimestamp(to_epoch(slot['end_time']), tz)
                     print(f"{start_dt.strftime('%Y-%m-%d %H:%M:%S %Z')} to {end_dt.strftime('%Y-%m-%d %H:%M:%S %Z')} - {slot['summary']}")
                 except Exception:
                     print(f"{slot['start_time']} to {slot['end_time']} - {slot['summary']}")
     elif args.command == 'schedule-meetings':
-        # Parse week range in user's timezone
-        def to_utc_iso(dt_str, is_start, tz_name):
-            date_pattern = r'^\d{4}-\d{2}-\d{2}$'
-            tz = pytz.timezone(tz_name)
-            if re.match(date_pattern, dt_str):
-                dt = datetime.strptime(dt_str, '%Y-%m-%d')
-                if is_start:
-                    dt = tz.localize(dt.replace(hour=0, minute=0, second=0))
-                else:
-                    dt = tz.localize(dt.replace(hour=23, minute=59, second=59))
-                return dt.astimezone(pytz.utc).isoformat().replace('+00:00', 'Z')
-            try:
-                dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-                if dt.tzinfo is None:
-                    dt = tz.localize(dt)
-                return dt.astimezone(pytz.utc).isoformat().replace('+00:00', 'Z')
-            except Exception:
-                return dt_str
-        # Load penalties from config if available
-        penalties = {
-            'key_attendee_absence': 100,
-            'required_member_absence': 1,
-            'key_meeting_absence': 5
-        }
-        config_path = 'data/config.json'
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config_json = json.load(f)
-            if 'penalties' in config_json:
-                penalties.update({k: v for k, v in config_json['penalties'].items() if v is not None})
-        # Override with CLI if provided
-        if args.penalty_key_attendee_absence is not None:
-            penalties['key_attendee_absence'] = args.penalty_key_attendee_absence
-        if args.penalty_required_member_absence is not None:
-            penalties['required_member_absence'] = args.penalty_required_member_absence
-        if args.penalty_key_meeting_absence is not None:
-            penalties['key_meeting_absence'] = args.penalty_key_meeting_absence
-        tz_name = get_timezone()
-        week_start = to_utc_iso(args.week_start, True, tz_name)
-        week_end = to_utc_iso(args.week_end, False, tz_name)
-        # Fetch data
-        meetings = load_json('data/meetings.json')
-        # Filter meetings if active_meetings is set
-        active_meetings_path = 'data/active_meetings.json'
-        if os.path.exists(active_meetings_path):
-            with open(active_meetings_path, 'r') as f:
-                active_meetings = set(json.load(f))
-            meetings = [m for m in meetings if m['name'] in active_meetings]
-        members = load_json('data/members.json')
-        service = authenticate_google()
-        slots = fetch_potential_times_from_calendar(service, week_start, week_end)
-        # Always use 60 minutes as the meeting duration
-        duration_minutes = 60
-        all_possible_slots = []
-        slot_index = 0
-        for i, window in enumerate(slots):
-            window_start = window['start_time']
-            window_end = window['end_time']
-            possible_slots = generate_possible_slots(window_start, window_end, duration_minutes)
-            for slot_start, slot_end in possible_slots:
-                all_possible_slots.append({
-                    'slot_id': f'slot{slot_index}',
-                    'start_time': slot_start,
-                    'end_time': slot_end,
-                    'location': window.get('location'),
-                    'window_id': i  # Track which window/event this slot comes from
-                })
-                slot_index += 1
-        # Build member lookup
-        member_lookup = {m['id']: m for m in members}
-        # SAT variable pool
-        vpool = IDPool()
-        var_map = {}
-        slot_map = {}
-        for meeting in meetings:
-            for slot in all_possible_slots:
-                var = vpool.id(f"m{meeting['id']}_s{slot['slot_id']}")
-                var_map[(meeting['id'], slot['slot_id'])] = var
-                slot_map[slot['slot_id']] = slot
-        # Fetch member conflicts
-        conflicts_by_member = {}
-        for member in members:
-            conflicts = fetch_member_conflicts(service, member['calendar_id'], week_start, week_end)
-            conflicts_by_member[member['id']] = conflicts
-        # Build availability matrix for all slots
-        slot_availability = {}
-        for slot in all_possible_slots:
-            slot_id = slot['slot_id']
-            slot_start = slot['start_time']
-            slot_end = slot['end_time']
-            available = []
-            for member in members:
-                member_id = member['id']
-                conflicts = conflicts_by_member.get(member_id, [])
-                if not any(overlaps(slot_start, slot_end, c[0], c[1]) for c in conflicts):
-                    available.append(member_id)
-            slot_availability[slot_id] = available
-        # Load key_attendees constraints
-        key_attendees_path = 'data/key_attendees.json'
-        if os.path.exists(key_attendees_path):
-            with open(key_attendees_path, 'r') as f:
-                key_attendees = json.load(f)
-        else:
-            key_attendees = []
-        # Filter key_attendees to only those for meetings being scheduled
-        meeting_names_set = set(m['name'] for m in meetings)
-        key_attendees = [c for c in key_attendees if c['meeting'] in meeting_names_set]
-        # Load key_meetings
-        key_meetings_path = 'data/key_meetings.json'
-        if os.path.exists(key_meetings_path):
-            with open(key_meetings_path, 'r') as f:
-                key_meetings = set(json.load(f))
-        else:
-            key_meetings = set()
-        # MaxSAT encoding
-        wcnf = WCNF()
-        # 1. Each meeting is scheduled exactly once (hard)
-        for meeting in meetings:
-            vars_for_meeting = [var_map[(meeting['id'], slot['slot_id'])] for slot in all_possible_slots]
-            if vars_for_meeting:  # Only add constraint if there are possible slots
-                cnf = CardEnc.equals(lits=vars_for_meeting, bound=1, vpool=vpool)
-                for clause in cnf.clauses:
-                    wcnf.append(clause)
-            else:
-                print(f"Warning: No possible slots found for meeting '{meeting['name']}' - all slots have conflicts")
-        # 1b. Key attendees constraints (soft, high penalty): for each, penalize if the member(s) cannot attend the meeting in the chosen slot
-        for constraint in key_attendees:
-            meeting_name = constraint['meeting']
-            members_list = constraint['members']
-            meeting_obj = next((m for m in meetings if m['name'] == meeting_name), None)
-            if not meeting_obj:
-                print(f"Warning: Could not find meeting for key_attendees: {constraint}")
-                continue
-            meeting_id = meeting_obj['id']
-            for member_name in members_list:
-                member_obj = next((m for m in members if m['name'] == member_name), None)
-                if not member_obj:
-                    print(f"Warning: Could not find member for key_attendees: {constraint}")
-                    continue
-                member_id = member_obj['id']
-                for slot in all_possible_slots:
-                    slot_id = slot['slot_id']
-                    available = slot_availability[slot_id]
-                    v = var_map[(meeting_id, slot_id)]
-                    if member_id not in available:
-                        wcnf.append([-v], weight=penalties['key_attendee_absence'])  # Soft: penalize if this member can't attend this meeting
-        # 2. Only one meeting per slot (hard)
-        for slot in all_possible_slots:
-            slot_id = slot['slot_id']
-            meetings_in_slot = [var_map[(meeting['id'], slot_id)] for meeting in meetings]
-            if len(meetings_in_slot) > 1:
-                cnf = CardEnc.atmost(lits=meetings_in_slot, bound=1, vpool=vpool)
-                for clause in cnf.clauses:
-                    wcnf.append(clause)
-        # 2b. No two meetings in overlapping slots from the same window/event (hard)
-        # Group slots by window_id
-        slots_by_window = defaultdict(list)
-        for slot in all_possible_slots:
-            slots_by_window[slot['window_id']].append(slot)
-        for window_slots in slots_by_window.values():
-            for i, slot1 in enumerate(window_slots):
-                for j, slot2 in enumerate(window_slots):
-                    if j <= i:
-                        continue
-                    # If slots overlap
-                    if overlaps(slot1['start_time'], slot1['end_time'], slot2['start_time'], slot2['end_time']):
-                        for meeting1 in meetings:
-                            for meeting2 in meetings:
-                                v1 = var_map[(meeting1['id'], slot1['slot_id'])]
-                                v2 = var_map[(meeting2['id'], slot2['slot_id'])]
-                                if v1 != v2:
-                                    wcnf.append([-v1, -v2])
-        # 3. Meetings only scheduled in slots where all required members are available (soft)
-        for meeting in meetings:
-            required_members = meeting['members']
-            for slot in all_possible_slots:
-                slot_id = slot['slot_id']
-                available = slot_availability[slot_id]
-                for m in required_members:
-                    v = var_map[(meeting['id'], slot_id)]
-                    if m not in available:
-                        # Soft: penalize if this member can't attend
-                        wcnf.append([-v], weight=penalties['required_member_absence'])
-        # 3b. Key meetings: penalize by 5 for each member who misses a key meeting
-        for meeting in meetings:
-            if meeting['name'] in key_meetings:
-                required_members = meeting['members']
-                for slot in all_possible_slots:
-                    slot_id = slot['slot_id']
-                    available = slot_availability[slot_id]
-                    for m in required_members:
-                        v = var_map[(meeting['id'], slot_id)]
-                        if m not in available:
-                            wcnf.append([-v], weight=penalties['key_meeting_absence'])
-        # 4. No double-booking for any member (soft, large penalty)
-        # (Removed: no longer penalize double-booking)
-        # Check if we have any constraints to solve
-        if not wcnf.hard:
-            print("No valid scheduling constraints found. This may happen if:")
-            print("- All meetings have conflicts in all available time slots")
-            print("- No potential meeting times are available")
-            print("- No meetings are configured")
-            return
-        
-        # Solve
-        with RC2(wcnf) as rc2:
-            if rc2.compute():
-                model = rc2.model
-                true_vars = set(v for v in model if v > 0)
-                scheduled = []
-                for (meeting_id, slot_id), var in var_map.items():
-                    if var in true_vars:
-                        meeting = next(m for m in meetings if m['id'] == meeting_id)
-                        slot = slot_map[slot_id]
-                        member_names = [member_lookup[mid]['name'] for mid in meeting['members']]
-                        missing = [member_lookup[mid]['name'] for mid in meeting['members'] if mid not in slot_availability[slot_id]]
-                        scheduled.append({'meeting': meeting, 'slot': slot, 'missing': missing})
-                # Attendance percentage calculation
-                total_assignments = 0
-                total_present = 0
-                for item in scheduled:
-                    meeting = item['meeting']
-                    missing = item['missing']
-                    total_assignments += len(meeting['members'])
-                    total_present += len(meeting['members']) - len(missing)
-                if total_assignments > 0:
-                    attendance_pct = 100.0 * total_present / total_assignments
-                    print(f"\nAttendance percentage: {total_present} / {total_assignments} = {attendance_pct:.2f}%")
-                else:
-                    print("\nAttendance percentage: N/A (no meetings)")
-                # Count conflicts
-                key_attendee_absences = 0
-                key_meeting_absences = 0
-                required_member_absences = 0
-                # Build lookup for key_attendees for quick access
-                key_attendees_lookup = {}
-                for c in key_attendees:
-                    key_attendees_lookup.setdefault(c['meeting'], set()).update(c['members'])
-                for item in scheduled:
-                    meeting = item['meeting']
-                    missing = item['missing']
-                    meeting_name = meeting['name']
-                    required_member_absences += len(missing)
-                    for m in missing:
-                        # Key attendee absence
-                        if meeting_name in key_attendees_lookup and m in key_attendees_lookup[meeting_name]:
-                            key_attendee_absences += 1
-                        # Key meeting absence
-                        if meeting_name in key_meetings:
-                            key_meeting_absences += 1
-                # Double-bookings
-                member_slot_meeting = []
-                for item in scheduled:
-                    meeting = item['meeting']
-                    slot = item['slot']
-                    for mid in meeting['members']:
-                        if member_lookup[mid]['name'] not in item['missing']:
-                            member_slot_meeting.append({'member_id': mid, 'member_name': member_lookup[mid]['name'], 'slot': slot, 'meeting': meeting})
-                double_booking_set = set()
-                for i, a in enumerate(member_slot_meeting):
-                    for j, b in enumerate(member_slot_meeting):
-                        if j <= i:
-                            continue
-                        if a['meeting']['id'] == b['meeting']['id']:
-                            continue  # skip same meeting
-                        if a['member_id'] == b['member_id']:
-                            if overlaps(a['slot']['start_time'], a['slot']['end_time'], b['slot']['start_time'], b['slot']['end_time']):
-                                # Use tuple to avoid double-counting
-                                double_booking_set.add(tuple(sorted([(a['member_id'], a['slot']['start_time'], a['slot']['end_time'], a['meeting']['id']), (b['member_id'], b['slot']['start_time'], b['slot']['end_time'], b['meeting']['id'])])))
-                print("\nConflicts:")
-                # Show detailed conflicts for each meeting
-                for item in scheduled:
-                    meeting = item['meeting']
-                    slot = item['slot']
-                    missing = item['missing']
-                    if missing:
-                        print(f"  {meeting['name']}: {', '.join(missing)}")
-                # Save schedule to user-specified Google Calendar if requested
-                if args.save_calendar:
-                    calendar_name = args.save_calendar
-                    cal_id = get_or_create_calendar(service, calendar_name)
-                    # Build double-booking info for each member/slot
-                    double_booked = set()
-                    for i, a in enumerate(member_slot_meeting):
-                        for j, b in enumerate(member_slot_meeting):
-                            if j <= i:
-                                continue
-                            if a['meeting']['id'] == b['meeting']['id']:
-                                continue  # skip same meeting
-                            if a['member_id'] == b['member_id']:
-                                if overlaps(a['slot']['start_time'], a['slot']['end_time'], b['slot']['start_time'], b['slot']['end_time']):
-                                    double_booked.add((a['member_id'], a['slot']['start_time'], a['slot']['end_time']))
-                                    double_booked.add((b['member_id'], b['slot']['start_time'], b['slot']['end_time']))
-                    for item in scheduled:
-                        meeting = item['meeting']
-                        slot = item['slot']
-                        missing = item['missing']
-                        db_members = [member_lookup[mid]['name'] for mid in meeting['members'] if (mid, slot['start_time'], slot['end_time']) in double_booked]
-                        description_lines = []
-                        if missing:
-                            description_lines.append('Missing: ' + ', '.join(missing))
-                        if db_members:
-                            description_lines.append('Double-booked: ' + ', '.join(db_members))
-                        description = '\n'.join(description_lines) if description_lines else None
-                        location = slot.get('location')
-                        try:
-                            create_event(service, cal_id, meeting['name'], slot['start_time'], slot['end_time'], description=description, location=location)
-                        except Exception as e:
-                            print(f"Failed to create event for {meeting['name']} at {slot['start_time']}: {e}")
-            else:
-                print("No schedule possible (should not happen unless no slots exist).")
+        schedule_meetings(args)
     elif args.command == 'load-config':
-        with open(args.config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml(args.config_file)
         # Members
         members = []
         name_to_id = {}
         for m in config.get('members', []):
-            member_id = str(uuid.uuid4())
+            member_id = generate_id()
             members.append({'id': member_id, 'name': m['name'], 'calendar_id': m['calendar_id']})
             name_to_id[m['name']] = member_id
-        with open('data/members.json', 'w') as f:
-            json.dump(members, f, indent=2)
+        save_json('data/members.json', members)
         # Meetings
         meetings = []
         for mtg in config.get('meetings', []):
-            meeting_id = str(uuid.uuid4())
+            meeting_id = generate_id()
             member_ids = [name_to_id[name] for name in mtg['members']]
             meetings.append({'id': meeting_id, 'name': mtg['name'], 'members': member_ids})
-        with open('data/meetings.json', 'w') as f:
-            json.dump(meetings, f, indent=2)
+        save_json('data/meetings.json', meetings)
         # active_meetings
         if 'active_meetings' in config:
-            with open('data/active_meetings.json', 'w') as f:
-                json.dump(config['active_meetings'], f, indent=2)
+            save_json('data/active_meetings.json', config['active_meetings'])
         # Potential times calendar and save calendar
         config_json = {}
         if 'potential_times_calendar_id' in config:
@@ -538,33 +727,24 @@ def main():
                     continue
                 key_attendees.append({'meeting': c['meeting'], 'members': members})
         # Always overwrite key_attendees.json, even if empty
-        with open(key_attendees_path, 'w') as f:
-            json.dump(key_attendees, f, indent=2)
+        save_json(key_attendees_path, key_attendees)
         # Key meetings
         key_meetings_path = 'data/key_meetings.json'
         if 'key_meetings' in config:
-            with open(key_meetings_path, 'w') as f:
-                json.dump(config['key_meetings'], f, indent=2)
-        with open('data/config.json', 'w') as f:
-            json.dump(config_json, f, indent=2)
+            save_json(key_meetings_path, config['key_meetings'])
+        save_json('data/config.json', config_json)
         print('Configuration loaded successfully.')
     elif args.command == 'add-constraint':
         # Add a fixed constraint to data/constraints.json
         constraints_path = 'data/constraints.json'
-        if os.path.exists(constraints_path):
-            with open(constraints_path, 'r') as f:
-                constraints = json.load(f)
-        else:
-            constraints = []
+        constraints = load_json(constraints_path)
         constraints.append({'meeting': args.meeting, 'members': args.members})
-        with open(constraints_path, 'w') as f:
-            json.dump(constraints, f, indent=2)
+        save_json(constraints_path, constraints)
         print(f"Added constraint: {args.members} must attend {args.meeting}")
     elif args.command == 'set-active-meetings':
         # Save the list of active meetings to data/active_meetings.json
         os.makedirs('data', exist_ok=True)
-        with open('data/active_meetings.json', 'w') as f:
-            json.dump(args.meeting_names, f, indent=2)
+        save_json('data/active_meetings.json', args.meeting_names)
         print(f"Set active meetings: {', '.join(args.meeting_names)}")
     else:
         parser.print_help()
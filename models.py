@@ -19,4 +19,16 @@ class Meeting:
 class PotentialMeetingTime:
     id: str
     start_time: str  # ISO format
-    end_time: str    # ISO format 
\ No newline at end of file
+    end_time: str    # ISO format 
+
+@dataclass
+class Slot:
+    # Declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('slot_id', 'start_time', 'end_time', 'start_epoch', 'end_epoch', 'location', 'window_id')
+    slot_id: str
+    start_time: str  # ISO format
+    end_time: str    # ISO format
+    start_epoch: int
+    end_epoch: int
+    location: Optional[str]
+    window_id: int   # index of the potential time window the slot comes from
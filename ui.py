@@ -1,20 +1,126 @@
+import gc
 import os
 import subprocess
 import sys
+import tempfile
+from collections import Counter
 from datetime import datetime, date, timedelta
 import pandas as pd
 import streamlit as st
-import yaml
-from calendar_service import authenticate_google
+from utils import load_yaml, save_yaml
 
 # Configuration
 CONFIG_PATH = "config.yaml"
 
-# Load config or defaults
-if os.path.exists(CONFIG_PATH):
-    with open(CONFIG_PATH, "r") as f:
-        config = yaml.safe_load(f)
-else:
+
+def apply_member_changes(config, members, original_members):
+    """Store edited members in the config, cascading renames and removals to meetings and key attendees."""
+    current_member_names = {m["name"] for m in members}
+    original_member_names = {m["name"] for m in original_members}
+
+    # Find deleted members
+    deleted_members = original_member_names - current_member_names
+
+    # Members that kept their calendar ID under a new name were renamed
+    new_names_by_calendar = {}
+    for new_member in members:
+        new_names_by_calendar.setdefault(new_member.get("calendar_id"), new_member["name"])
+    renames = {}
+    for old_member in original_members:
+        new_name = new_names_by_calendar.get(old_member.get("calendar_id"))
+        if old_member["name"] in deleted_members and new_name is not None:
+            renames[old_member["name"]] = new_name
+    removed_members = deleted_members - renames.keys()
+
+    # Apply renames and DELETE cascades to every reference in one pass
+    for entry in config.get("meetings", []) + config.get("key_attendees", []):
+        names = entry.get("members", [])
+        updated_names = [renames.get(m, m) for m in names if m not in removed_members]
+        if updated_names != names:
+            entry["members"] = updated_names
+
+    # Remove key attendees that have no members left
+    if deleted_members:
+        config["key_attendees"] = [ka for ka in config.get("key_attendees", []) if ka.get("members", [])]
+
+    config["members"] = members
+
+
+def apply_meeting_changes(config, meetings, original_meetings):
+    """Store edited meetings in the config, cascading renames and removals to key attendees, key meetings and active meetings."""
+    current_meeting_names = {m["name"] for m in meetings}
+    original_meeting_names = {m["name"] for m in original_meetings}
+
+    # Find deleted meetings
+    deleted_meetings = original_meeting_names - current_meeting_names
+
+    # Find meetings that have changed names by comparing positions
+    renames = {old["name"]: new["name"] for old, new in zip(original_meetings, meetings) if old["name"] != new["name"]}
+
+    # Apply renames, then DELETE cascades, to every meeting reference in one pass per list
+    if renames or deleted_meetings:
+        key_attendees = config.get("key_attendees", [])
+        for ka in key_attendees:
+            if ka.get("meeting") in renames:
+                ka["meeting"] = renames[ka["meeting"]]
+        config["key_attendees"] = [ka for ka in key_attendees if ka.get("meeting") not in deleted_meetings]
+        for key in ("key_meetings", "active_meetings"):
+            renamed = (renames.get(m, m) for m in config.get(key, []))
+            config[key] = [m for m in renamed if m not in deleted_meetings]
+
+    config["meetings"] = meetings
+
+
+# Sections reloaded from the saved file along with the one whose renames cascade into them
+CASCADED_SECTIONS = {
+    "members": ("meetings", "key_attendees", "key_meetings", "active_meetings"),
+    "meetings": ("key_attendees", "key_meetings", "active_meetings"),
+}
+
+
+def save_sections(config, edits, success_message):
+    """Write the edited values of every changed section in `edits` to config.yaml at once and mark them saved."""
+    unsaved = st.session_state["unsaved_changes"]
+    original = st.session_state["original_values"]
+    sections = [section for section in edits if unsaved[section]]
+    if not sections:
+        st.info("No changes to save.")
+        return
+    try:
+        # Store the plain sections first, then cascade meeting and member renames over them
+        for section in sections:
+            if section == "calendar_id":
+                config["potential_times_calendar_id"] = edits[section]
+            elif section not in CASCADED_SECTIONS:
+                config[section] = edits[section]
+        if "meetings" in sections:
+            apply_meeting_changes(config, edits["meetings"], original["meetings"])
+        if "members" in sections:
+            apply_member_changes(config, edits["members"], original["members"])
+        save_yaml(CONFIG_PATH, config)
+
+        # Reload config and reset the saved sections, and those the renames touched, to the file's values
+        config.update(load_yaml(CONFIG_PATH) or {})
+        reloaded = set(sections)
+        for section in sections:
+            reloaded.update(CASCADED_SECTIONS.get(section, ()))
+        for section in reloaded:
+            if section == "calendar_id":
+                original[section] = config.get("potential_times_calendar_id", "")
+            else:
+                saved = config.get(section, {} if section == "penalties" else [])
+                st.session_state[section] = saved.copy()
+                original[section] = saved.copy()
+            unsaved[section] = False
+        st.success(success_message)
+    except Exception as e:
+        st.error(f"Error saving changes: {e}")
+
+
+# Load config or defaults; load_yaml's own stat tells us whether the file exists
+try:
+    config = load_yaml(CONFIG_PATH)
+except FileNotFoundError:
     config = {
         "members": [
             {"name": "Alice", "calendar_id": "alice_calendar_id@group.calendar.google.com"},
@@ -35,6 +141,14 @@ else:
         "potential_times_calendar_id": ""
     }
 
+# Dropping every session-state entry discards unsaved edits and frees this session's copies of the config;
+# everything is rebuilt from config.yaml on the rerun
+if st.sidebar.button("Reset session", key="reset_session"):
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    gc.collect()
+    st.rerun()
+
 # Initialize session state
 if "unsaved_changes" not in st.session_state:
     st.session_state["unsaved_changes"] = {
@@ -42,38 +156,39 @@ if "unsaved_changes" not in st.session_state:
         "key_meetings": False, "active_meetings": False, "penalties": False, "calendar_id": False
     }
 
-# Always update original_values to match current config
-st.session_state["original_values"] = {
-    "members": config.get("members", []).copy(),
-    "meetings": config.get("meetings", []).copy(),
-    "key_attendees": config.get("key_attendees", []).copy(),
-    "key_meetings": config.get("key_meetings", []).copy(),
-    "active_meetings": config.get("active_meetings", []).copy(),
-    "penalties": config.get("penalties", {}).copy(),
-    "calendar_id": config.get("potential_times_calendar_id", "")
-}
+# Snapshot the saved config once per session; each save handler refreshes the keys it writes
+if "original_values" not in st.session_state:
+    st.session_state["original_values"] = {
+        "members": config.get("members", []).copy(),
+        "meetings": config.get("meetings", []).copy(),
+        "key_attendees": config.get("key_attendees", []).copy(),
+        "key_meetings": config.get("key_meetings", []).copy(),
+        "active_meetings": config.get("active_meetings", []).copy(),
+        "penalties": config.get("penalties", {}).copy(),
+        "calendar_id": config.get("potential_times_calendar_id", "")
+    }
 
 st.title("G-Cal Meeting Scheduler")
 
+# Instructions, with the spacing CSS in the same element
 st.markdown("""
 **Instructions:**
 - Use the button below to authenticate with Google (required for calendar access).
 - Edit your configuration (members, meetings, penalties, etc.) below.
 - Click the save button for each section to update `config.yaml`.
 - To run this UI: `streamlit run ui.py`
-""")
 
-# CSS for spacing
-st.markdown('''
 <style>
 .block-container > div { margin-bottom: 0.5rem; }
 </style>
-''', unsafe_allow_html=True)
+""", unsafe_allow_html=True)
 
 # Google Auth
+# The Google API client is only imported once a button is clicked, keeping it off the first page load
 auth_col1, auth_col2 = st.columns([1, 1])
 if auth_col1.button("Authenticate with Google"):
     try:
+        from calendar_service import authenticate_google
         authenticate_google()
         st.success("Authentication complete!")
     except Exception as e:
@@ -81,8 +196,10 @@ if auth_col1.button("Authenticate with Google"):
 
 if auth_col2.button("Re-authenticate with Google"):
     try:
-        if os.path.exists('token.pickle'):
-            os.remove('token.pickle')
+        from calendar_service import TOKEN_PATH, authenticate_google, clear_service_cache
+        if os.path.exists(TOKEN_PATH):
+            os.remove(TOKEN_PATH)
+        clear_service_cache()
         authenticate_google()
         st.success("Re-authentication complete!")
     except Exception as e:
@@ -99,15 +216,7 @@ else:
     st.session_state["unsaved_changes"]["calendar_id"] = False
 
 if st.button("💾 Save Calendar ID", key="save_calendar_id"):
-    try:
-        config["potential_times_calendar_id"] = potential_times_calendar_id
-        with open(CONFIG_PATH, "w") as f:
-            yaml.safe_dump(config, f)
-        st.session_state["original_values"]["calendar_id"] = potential_times_calendar_id
-        st.session_state["unsaved_changes"]["calendar_id"] = False
-        st.success("Calendar ID saved!")
-    except Exception as e:
-        st.error(f"Error saving calendar ID: {e}")
+    save_sections(config, {"calendar_id": potential_times_calendar_id}, "Calendar ID saved!")
 
 # Config Editor
 st.header("Edit Configuration")
@@ -118,9 +227,9 @@ with st.expander("Member Details", expanded=True):
     if "members" not in st.session_state:
         st.session_state["members"] = config.get("members", []).copy()
 
-    members_df = pd.DataFrame(st.session_state["members"])
+    # The editor takes and returns a list of records, so no DataFrame round-trip is needed
     edited_members = st.data_editor(
-        members_df,
+        st.session_state["members"],
         num_rows="dynamic",
         use_container_width=True,
         hide_index=True,
@@ -134,16 +243,15 @@ with st.expander("Member Details", expanded=True):
 
     # Always update session state with the returned data
     if edited_members is not None:
-        new_members_data = edited_members.to_dict("records")
+        new_members_data = edited_members
         if new_members_data != st.session_state["members"]:
             st.session_state["members"] = new_members_data
             # Force a rerun to ensure validation runs with updated data
             st.rerun()
 
     # Check for duplicate member names in real-time (check ALL members with names, regardless of calendar_id)
-    all_members_with_names = [m for m in st.session_state["members"] if m["name"]]
-    member_names = [m["name"] for m in all_members_with_names]
-    duplicate_member_names = [name for name in set(member_names) if member_names.count(name) > 1]
+    member_name_counts = Counter(m["name"] for m in st.session_state["members"] if m["name"])
+    duplicate_member_names = [name for name, count in member_name_counts.items() if count > 1]
     
     if duplicate_member_names:
         st.error(f"❌ Duplicate member names detected: {', '.join(duplicate_member_names)}. Please fix before saving.")
@@ -160,81 +268,7 @@ with st.expander("Member Details", expanded=True):
         st.session_state["unsaved_changes"]["members"] = False
 
     if st.button("💾 Save Members", key="save_members"):
-        try:
-            # Check for duplicate member names
-            member_names = [m["name"] for m in current_members if m["name"]]
-            duplicate_names = [name for name in set(member_names) if member_names.count(name) > 1]
-            
-            if duplicate_names:
-                st.error(f"❌ Duplicate member names found: {', '.join(duplicate_names)}. Please ensure all member names are unique.")
-                st.stop()
-            
-            # Get the set of current member names
-            current_member_names = {m["name"] for m in current_members}
-            original_member_names = {m["name"] for m in st.session_state["original_values"]["members"]}
-            
-            # Find deleted members
-            deleted_members = original_member_names - current_member_names
-            
-            # Handle cascading updates when member names change
-            for old_member in st.session_state["original_values"]["members"]:
-                old_name = old_member["name"]
-                for new_member in current_members:
-                    if new_member.get("calendar_id") == old_member.get("calendar_id"):
-                        new_name = new_member["name"]
-                        if old_name != new_name:
-                            # Update all references to this member name in the config
-                            for meeting in config.get("meetings", []):
-                                if old_name in meeting.get("members", []):
-                                    meeting["members"] = [new_name if m == old_name else m for m in meeting["members"]]
-                            for ka in config.get("key_attendees", []):
-                                if old_name in ka.get("members", []):
-                                    ka["members"] = [new_name if m == old_name else m for m in ka["members"]]
-                            break
-            
-            # Handle DELETE cascades for removed members
-            for deleted_member in deleted_members:
-                # Remove from all meetings
-                for meeting in config.get("meetings", []):
-                    if deleted_member in meeting.get("members", []):
-                        meeting["members"] = [m for m in meeting.get("members", []) if m != deleted_member]
-                
-                # Remove from all key attendees
-                for ka in config.get("key_attendees", []):
-                    if deleted_member in ka.get("members", []):
-                        ka["members"] = [m for m in ka.get("members", []) if m != deleted_member]
-                
-                # Remove key attendees that have no members left
-                config["key_attendees"] = [ka for ka in config.get("key_attendees", []) if ka.get("members", [])]
-            
-            config["members"] = current_members
-            with open(CONFIG_PATH, "w") as f:
-                yaml.safe_dump(config, f)
-            
-            # Reload config and update session state
-            with open(CONFIG_PATH, "r") as f:
-                updated_config = yaml.safe_load(f)
-                if updated_config is None:
-                    updated_config = {}
-            
-            # Update the global config variable to reflect the changes
-            config.update(updated_config)
-            
-            st.session_state["original_values"]["members"] = current_members.copy()
-            st.session_state["original_values"]["meetings"] = updated_config.get("meetings", []).copy()
-            st.session_state["original_values"]["key_attendees"] = updated_config.get("key_attendees", []).copy()
-            st.session_state["original_values"]["key_meetings"] = updated_config.get("key_meetings", []).copy()
-            st.session_state["original_values"]["active_meetings"] = updated_config.get("active_meetings", []).copy()
-            
-            st.session_state["meetings"] = updated_config.get("meetings", []).copy()
-            st.session_state["key_attendees"] = updated_config.get("key_attendees", []).copy()
-            st.session_state["key_meetings"] = updated_config.get("key_meetings", []).copy()
-            st.session_state["active_meetings"] = updated_config.get("active_meetings", []).copy()
-            
-            st.session_state["unsaved_changes"]["members"] = False
-            st.success("Members saved!")
-        except Exception as e:
-            st.error(f"Error saving members: {e}")
+        save_sections(config, {"members": current_members}, "Members saved!")
 
 # Meetings
 st.subheader("Meetings")
@@ -242,56 +276,37 @@ with st.expander("Meeting Details", expanded=True):
     if "meetings" not in st.session_state:
         st.session_state["meetings"] = config.get("meetings", []).copy()
 
-    if "meeting_remove_idxs" not in st.session_state:
-        st.session_state["meeting_remove_idxs"] = []
-
     member_names = [m["name"] for m in config.get("members", []) if m["name"]]
 
-    # Table header
-    meeting_header_cols = st.columns([4, 7, 1])
-    meeting_header_cols[0].markdown("<div style='margin-bottom:-18px'><b>Meeting Name</b></div>", unsafe_allow_html=True)
-    meeting_header_cols[1].markdown("<div style='margin-bottom:-18px'><b>Attendees</b></div>", unsafe_allow_html=True)
+    meetings_df = pd.DataFrame(st.session_state["meetings"], columns=["name", "members"])
+    edited_meetings = st.data_editor(
+        meetings_df,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "name": st.column_config.TextColumn("Meeting Name", width="medium"),
+            "members": st.column_config.MultiselectColumn("Attendees", options=member_names, width="large")
+        },
+        key="edited_meetings_df"
+    )
 
-    # Process meetings
-    for i, meeting in enumerate(st.session_state["meetings"]):
-        cols = st.columns([4, 7, 1])
-        
-        name_key = f"meeting_name_{i}"
-        attendees_key = f"meeting_attendees_{i}"
-        remove_key = f"remove_meeting_{i}"
-        
-        mtg_name = cols[0].text_input("", meeting["name"], key=name_key)
-        saved_member_names = [m["name"] for m in config.get("members", []) if m["name"]]
-        attendees = cols[1].multiselect("", saved_member_names, meeting.get("members", []), key=attendees_key)
-        
-        cols[2].markdown("<div style='height: 27px'></div>", unsafe_allow_html=True)
-        if cols[2].button("❌", key=remove_key):
-            st.session_state["meeting_remove_idxs"].append(i)
-        
-        # Update session state immediately
-        if st.session_state["meetings"][i]["name"] != mtg_name:
-            st.session_state["meetings"][i]["name"] = mtg_name
-            st.rerun()
-        if st.session_state["meetings"][i].get("members") != attendees:
-            st.session_state["meetings"][i]["members"] = attendees
+    # Always update session state with the returned data
+    if edited_meetings is not None:
+        new_meetings_data = [
+            {"name": row["name"] or "", "members": list(row["members"]) if row["members"] is not None else []}
+            for row in edited_meetings.to_dict("records")
+        ]
+        if new_meetings_data != st.session_state["meetings"]:
+            st.session_state["meetings"] = new_meetings_data
             st.rerun()
 
-    # Remove meetings marked for deletion
-    for idx in reversed(st.session_state["meeting_remove_idxs"]):
-        if idx < len(st.session_state["meetings"]):
-            st.session_state["meetings"].pop(idx)
-    st.session_state["meeting_remove_idxs"] = []
-
-    if st.button("Add new meeting", key="add_meeting"):
-        st.session_state["meetings"].append({"name": "", "members": []})
-        st.rerun()
-
     # Check for changes in meetings - compare against actual config file data
     current_meetings = [m for m in st.session_state["meetings"] if m["name"]]
     
     # Check for duplicate meeting names in real-time
-    meeting_names = [m["name"] for m in current_meetings if m["name"]]
-    duplicate_meeting_names = [name for name in set(meeting_names) if meeting_names.count(name) > 1]
+    meeting_name_counts = Counter(m["name"] for m in current_meetings)
+    duplicate_meeting_names = [name for name, count in meeting_name_counts.items() if count > 1]
     
     if duplicate_meeting_names:
         st.error(f"❌ Duplicate meeting names detected: {', '.join(duplicate_meeting_names)}. Please fix before saving.")
@@ -305,92 +320,7 @@ with st.expander("Meeting Details", expanded=True):
         st.session_state["unsaved_changes"]["meetings"] = False
 
     if st.button("💾 Save Meetings", key="save_meetings"):
-        try:
-            # Check for duplicate meeting names
-            meeting_names = [m["name"] for m in st.session_state["meetings"] if m["name"]]
-            duplicate_names = [name for name in set(meeting_names) if meeting_names.count(name) > 1]
-            
-            if duplicate_names:
-                st.error(f"❌ Duplicate meeting names found: {', '.join(duplicate_names)}. Please ensure all meeting names are unique.")
-                st.stop()
-            
-            # Get the set of current meeting names
-            current_meeting_names = {m["name"] for m in st.session_state["meetings"] if m["name"]}
-            original_meeting_names = {m["name"] for m in st.session_state["original_values"]["meetings"]}
-            
-            # Find deleted meetings
-            deleted_meetings = original_meeting_names - current_meeting_names
-            
-            # Handle cascading updates when meeting names change
-            # Match meetings by their position in the list for more reliable updates
-            original_meetings = st.session_state["original_values"]["meetings"]
-            current_meetings = [m for m in st.session_state["meetings"] if m["name"]]
-            
-            # Find meetings that have changed names by comparing positions
-            for i, (old_meeting, new_meeting) in enumerate(zip(original_meetings, current_meetings)):
-                old_name = old_meeting["name"]
-                new_name = new_meeting["name"]
-                
-                if old_name != new_name:
-                    # Update all references to this meeting name in the config
-                    for ka in config.get("key_attendees", []):
-                        if ka.get("meeting") == old_name:
-                            ka["meeting"] = new_name
-                    
-                    # Update key_meetings list - replace old_name with new_name
-                    if "key_meetings" not in config:
-                        config["key_meetings"] = []
-                    if old_name in config["key_meetings"]:
-                        config["key_meetings"] = [new_name if m == old_name else m for m in config["key_meetings"]]
-                    
-                    # Update active_meetings list - replace old_name with new_name
-                    if "active_meetings" not in config:
-                        config["active_meetings"] = []
-                    if old_name in config["active_meetings"]:
-                        config["active_meetings"] = [new_name if m == old_name else m for m in config["active_meetings"]]
-            
-            # Handle DELETE cascades for removed meetings
-            for deleted_meeting in deleted_meetings:
-                # Remove from key_attendees
-                config["key_attendees"] = [ka for ka in config.get("key_attendees", []) if ka.get("meeting") != deleted_meeting]
-                
-                # Remove from key_meetings
-                if "key_meetings" in config:
-                    config["key_meetings"] = [m for m in config["key_meetings"] if m != deleted_meeting]
-                
-                # Remove from active_meetings
-                if "active_meetings" in config:
-                    config["active_meetings"] = [m for m in config["active_meetings"] if m != deleted_meeting]
-            
-            config["meetings"] = [m for m in st.session_state["meetings"] if m["name"]]
-            with open(CONFIG_PATH, "w") as f:
-                yaml.safe_dump(config, f)
-            
-            # Reload config and update session state
-            with open(CONFIG_PATH, "r") as f:
-                updated_config = yaml.safe_load(f)
-                if updated_config is None:
-                    updated_config = {}
-            
-            # Update the global config variable to reflect the changes
-            config.update(updated_config)
-            
-            st.session_state["original_values"]["meetings"] = config["meetings"].copy()
-            st.session_state["original_values"]["key_attendees"] = updated_config.get("key_attendees", []).copy()
-            st.session_state["original_values"]["key_meetings"] = updated_config.get("key_meetings", []).copy()
-            st.session_state["original_values"]["active_meetings"] = updated_config.get("active_meetings", []).copy()
-            
-            st.session_state["key_attendees"] = updated_config.get("key_attendees", []).copy()
-            st.session_state["key_meetings"] = updated_config.get("key_meetings", []).copy()
-            st.session_state["active_meetings"] = updated_config.get("active_meetings", []).copy()
-            
-            st.session_state["unsaved_changes"]["meetings"] = False
-            st.session_state["unsaved_changes"]["key_attendees"] = False
-            st.session_state["unsaved_changes"]["key_meetings"] = False
-            st.session_state["unsaved_changes"]["active_meetings"] = False
-            st.success("Meetings saved!")
-        except Exception as e:
-            st.error(f"Error saving meetings: {e}")
+        save_sections(config, {"meetings": current_meetings}, "Meetings saved!")
 
 # Key Attendees
 st.subheader("Key Attendees")
@@ -398,53 +328,36 @@ with st.expander("Key Attendee Details", expanded=True):
     if "key_attendees" not in st.session_state:
         st.session_state["key_attendees"] = config.get("key_attendees", []).copy()
 
-    if "ka_remove_idxs" not in st.session_state:
-        st.session_state["ka_remove_idxs"] = []
-
     meeting_names = [m["name"] for m in config.get("meetings", []) if m["name"]]
+    meeting_name_set = set(meeting_names)
     member_names = [m["name"] for m in config.get("members", []) if m["name"]]
 
-    # Table header
-    ka_header_cols = st.columns([4, 7, 1])
-    ka_header_cols[0].markdown("<div style='margin-bottom:-18px'><b>Meeting</b></div>", unsafe_allow_html=True)
-    ka_header_cols[1].markdown("<div style='margin-bottom:-18px'><b>Key Attendees</b></div>", unsafe_allow_html=True)
-
-    for i, ka in enumerate(st.session_state["key_attendees"]):
-        # Skip key attendees that reference non-existent meetings
-        if ka.get("meeting") not in meeting_names:
-            continue
-            
-        cols = st.columns([4, 7, 1])
-        
-        meeting_key = f"ka_meeting_{i}"
-        attendees_key = f"ka_attendees_{i}"
-        remove_key = f"remove_ka_{i}"
-        
-        meeting = cols[0].selectbox("", meeting_names, index=meeting_names.index(ka["meeting"]) if ka.get("meeting") in meeting_names else 0, key=meeting_key)
-        saved_member_names = [m["name"] for m in config.get("members", []) if m["name"]]
-        attendees = cols[1].multiselect("", saved_member_names, ka.get("members", []), key=attendees_key)
-        
-        cols[2].markdown("<div style='height: 28px'></div>", unsafe_allow_html=True)
-        if cols[2].button("❌", key=remove_key):
-            st.session_state["ka_remove_idxs"].append(i)
-        
-        # Update session state immediately
-        if st.session_state["key_attendees"][i]["meeting"] != meeting:
-            st.session_state["key_attendees"][i]["meeting"] = meeting
-            st.rerun()
-        if st.session_state["key_attendees"][i].get("members") != attendees:
-            st.session_state["key_attendees"][i]["members"] = attendees
-            st.rerun()
+    # Hide key attendees that reference non-existent meetings, keeping them in session state
+    shown_key_attendees = [ka for ka in st.session_state["key_attendees"] if ka.get("meeting") in meeting_name_set]
+    hidden_key_attendees = [ka for ka in st.session_state["key_attendees"] if ka.get("meeting") not in meeting_name_set]
 
-    # Remove key attendees marked for deletion
-    for idx in reversed(st.session_state["ka_remove_idxs"]):
-        if idx < len(st.session_state["key_attendees"]):
-            st.session_state["key_attendees"].pop(idx)
-    st.session_state["ka_remove_idxs"] = []
+    key_attendees_df = pd.DataFrame(shown_key_attendees, columns=["meeting", "members"])
+    edited_key_attendees = st.data_editor(
+        key_attendees_df,
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "meeting": st.column_config.SelectboxColumn("Meeting", options=meeting_names, width="medium"),
+            "members": st.column_config.MultiselectColumn("Key Attendees", options=member_names, width="large")
+        },
+        key="edited_key_attendees_df"
+    )
 
-    if st.button("Add new key attendee", key="add_ka"):
-        st.session_state["key_attendees"].append({"meeting": meeting_names[0] if meeting_names else "", "members": []})
-        st.rerun()
+    # Always update session state with the returned data
+    if edited_key_attendees is not None:
+        new_key_attendees_data = [
+            {"meeting": row["meeting"] or "", "members": list(row["members"]) if row["members"] is not None else []}
+            for row in edited_key_attendees.to_dict("records")
+        ]
+        if new_key_attendees_data != shown_key_attendees:
+            st.session_state["key_attendees"] = new_key_attendees_data + hidden_key_attendees
+            st.rerun()
 
     # Check for changes in key attendees - compare against actual config file data
     current_key_attendees = [ka for ka in st.session_state["key_attendees"] if ka["meeting"] and ka["members"]]
@@ -455,21 +368,13 @@ with st.expander("Key Attendee Details", expanded=True):
         st.session_state["unsaved_changes"]["key_attendees"] = False
 
     if st.button("💾 Save Key Attendees", key="save_ka"):
-        try:
-            config["key_attendees"] = [ka for ka in st.session_state["key_attendees"] if ka["meeting"] and ka["members"]]
-            with open(CONFIG_PATH, "w") as f:
-                yaml.safe_dump(config, f)
-            st.session_state["original_values"]["key_attendees"] = config["key_attendees"].copy()
-            st.session_state["unsaved_changes"]["key_attendees"] = False
-            st.success("Key attendees saved!")
-        except Exception as e:
-            st.error(f"Error saving key attendees: {e}")
+        save_sections(config, {"key_attendees": current_key_attendees}, "Key attendees saved!")
 
 # Key Meetings
 st.subheader("Key Meetings")
 with st.expander("Key Meeting Details", expanded=True):
     config_key_meetings = config.get("key_meetings", [])
-    valid_key_meetings = [m for m in config_key_meetings if m in meeting_names]
+    valid_key_meetings = [m for m in config_key_meetings if m in meeting_name_set]
 
     current_key_meetings = st.multiselect(
         "",
@@ -486,15 +391,7 @@ with st.expander("Key Meeting Details", expanded=True):
         st.session_state["unsaved_changes"]["key_meetings"] = False
 
     if st.button("💾 Save Key Meetings", key="save_key_meetings"):
-        try:
-            config["key_meetings"] = st.session_state["key_meetings"]
-            with open(CONFIG_PATH, "w") as f:
-                yaml.safe_dump(config, f)
-            st.session_state["original_values"]["key_meetings"] = st.session_state["key_meetings"].copy()
-            st.session_state["unsaved_changes"]["key_meetings"] = False
-            st.success("Key meetings saved!")
-        except Exception as e:
-            st.error(f"Error saving key meetings: {e}")
+        save_sections(config, {"key_meetings": current_key_meetings}, "Key meetings saved!")
 
 # Penalties
 st.subheader("Penalties")
@@ -502,19 +399,19 @@ with st.expander("Penalty Details", expanded=True):
     if "penalties" not in st.session_state:
         st.session_state["penalties"] = config.get("penalties", {}).copy()
 
-    penalty_items = list(st.session_state["penalties"].items())
-    penalty_cols = st.columns([4, 2, 1])
-    penalty_cols[0].markdown("**Penalty Name**")
-    penalty_cols[1].markdown("**Value**")
-    penalty_cols[2].markdown("")
-
-    for i, (pen_name, pen_val) in enumerate(penalty_items):
-        cols = st.columns([4, 2, 1])
-        cols[0].markdown(f"<div style='line-height:100px; vertical-align: middle;'>{pen_name}</div>", unsafe_allow_html=True)
-        value = cols[1].number_input("", value=pen_val, key=f"penalty_value_{i}")
-        penalty_items[i] = (pen_name, value)
+    penalties_df = pd.DataFrame(list(st.session_state["penalties"].items()), columns=["name", "value"])
+    edited_penalties = st.data_editor(
+        penalties_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "name": st.column_config.TextColumn("Penalty Name", disabled=True),
+            "value": st.column_config.NumberColumn("Value", required=True)
+        },
+        key="edited_penalties_df"
+    )
 
-    st.session_state["penalties"] = {k: v for k, v in penalty_items if k}
+    st.session_state["penalties"] = {row["name"]: row["value"] for row in edited_penalties.to_dict("records") if row["name"]}
 
     if st.session_state["penalties"] != st.session_state["original_values"]["penalties"]:
         st.session_state["unsaved_changes"]["penalties"] = True
@@ -523,21 +420,13 @@ with st.expander("Penalty Details", expanded=True):
         st.session_state["unsaved_changes"]["penalties"] = False
 
     if st.button("💾 Save Penalties", key="save_penalties"):
-        try:
-            config["penalties"] = st.session_state["penalties"]
-            with open(CONFIG_PATH, "w") as f:
-                yaml.safe_dump(config, f)
-            st.session_state["original_values"]["penalties"] = st.session_state["penalties"].copy()
-            st.session_state["unsaved_changes"]["penalties"] = False
-            st.success("Penalties saved!")
-        except Exception as e:
-            st.error(f"Error saving penalties: {e}")
+        save_sections(config, {"penalties": st.session_state["penalties"]}, "Penalties saved!")
 
 # Active Meetings
 st.subheader("Active Meetings")
 
 config_active_meetings = config.get("active_meetings", [])
-valid_active_meetings = [m for m in config_active_meetings if m in meeting_names]
+valid_active_meetings = [m for m in config_active_meetings if m in meeting_name_set]
 
 # Initialize session state if not exists
 if "active_meetings" not in st.session_state:
@@ -560,15 +449,19 @@ else:
     st.session_state["unsaved_changes"]["active_meetings"] = False
 
 if st.button("💾 Save Active Meetings", key="save_active_meetings"):
-    try:
-        config["active_meetings"] = current_active_meetings
-        with open(CONFIG_PATH, "w") as f:
-            yaml.safe_dump(config, f)
-        st.session_state["original_values"]["active_meetings"] = current_active_meetings.copy()
-        st.session_state["unsaved_changes"]["active_meetings"] = False
-        st.success("Active meetings saved!")
-    except Exception as e:
-        st.error(f"Error saving active meetings: {e}")
+    save_sections(config, {"active_meetings": current_active_meetings}, "Active meetings saved!")
+
+# Save All
+if st.button("💾 Save All Changes", key="save_all"):
+    save_sections(config, {
+        "calendar_id": potential_times_calendar_id,
+        "members": current_members,
+        "meetings": current_meetings,
+        "key_attendees": current_key_attendees,
+        "key_meetings": current_key_meetings,
+        "penalties": st.session_state["penalties"],
+        "active_meetings": current_active_meetings,
+    }, "All changes saved!")
 
 # Run Scheduler
 st.header("Run Scheduler")
@@ -584,10 +477,9 @@ if st.button("Run Scheduler"):
     else:
         # Reload config from file to ensure we have the latest data
         try:
-            with open(CONFIG_PATH, "r") as f:
-                latest_config = yaml.safe_load(f)
-                if latest_config is None:
-                    latest_config = {}
+            latest_config = load_yaml(CONFIG_PATH)
+            if latest_config is None:
+                latest_config = {}
             
             # Validate that we have the required configuration
             if not latest_config.get("members"):
@@ -611,72 +503,81 @@ if st.button("Run Scheduler"):
             st.error(f"❌ Error loading configuration: {e}")
             st.stop()
         
+        # -u keeps the scheduler's stdout unbuffered so its lines arrive as they're printed
         cmd = [
-            sys.executable, "main.py", "schedule-meetings",
+            sys.executable, "-u", "main.py", "schedule-meetings",
             week_start.isoformat(), week_end.isoformat(),
             "--save-calendar", calendar_name
         ]
         
         with st.spinner("Running scheduler..."):
             try:
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+                # Stream stdout line by line, showing the latest line while the scheduler runs;
+                # stderr goes to a temporary file so a full pipe can't stall the process
+                progress = st.empty()
+                output_lines = []
+                with tempfile.TemporaryFile(mode="w+") as stderr_file:
+                    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True, bufsize=1) as proc:
+                        for line in proc.stdout:
+                            line = line.rstrip("\n")
+                            output_lines.append(line)
+                            if line.strip():
+                                progress.text(line)
+                    progress.empty()
+                    if proc.returncode != 0:
+                        stderr_file.seek(0)
+                        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr_file.read())
                 
                 # Parse the output to extract key information
-                output_lines = result.stdout.split('\n')
                 attendance_line = None
                 conflicts_start = None
                 conflicts_end = None
                 
+                # Dispatch on each line's prefix; inside the conflict list only the closing blank line matters
                 for i, line in enumerate(output_lines):
-                    if "Attendance percentage:" in line:
+                    if conflicts_start is not None:
+                        if not line.strip():
+                            conflicts_end = i
+                            break
+                    elif line.startswith("Attendance percentage:"):
                         attendance_line = line
-                    elif "Conflicts:" in line:
+                    elif line.startswith("Conflicts:"):
                         conflicts_start = i
-                    elif conflicts_start and line.strip() == "":
-                        conflicts_end = i
-                        break
+                # Lines are read without the empty one split() left after the final
+                # newline, so the conflict list may run to the end of the output
+                if conflicts_start is not None and conflicts_end is None:
+                    conflicts_end = len(output_lines)
                 
                 # Display results
                 if attendance_line:
                     st.success(f"✅ {attendance_line}")
                 
-                if conflicts_start and conflicts_end:
+                # Build the conflicts and success blocks as one HTML string so they render in a single element
+                result_html = []
+                if conflicts_start is not None:
                     conflicts = output_lines[conflicts_start:conflicts_end]
                     if len(conflicts) > 1:  # More than just "Conflicts:" header
                         # Format each dance's conflicts on a separate line
                         conflict_lines = [line.strip() for line in conflicts[1:] if line.strip()]
                         conflict_text = "<br>".join(conflict_lines)
-                        st.markdown(
-                            f'''
-                            <div style="background-color:rgba(255,43,43,0.7); padding: 16px; border-radius: 8px;">
-                                🚧 Conflicts
-                                <pre style="margin:0; font-size: 1rem; background: none; border: none;">{conflict_text}</pre>
-                            </div>
-                            ''',
-                            unsafe_allow_html=True,
-                        )
-                        st.markdown("<br>", unsafe_allow_html=True)
+                        conflict_opacity = 0.7
                     else:
-                        st.markdown(
-                            f'''
-                            <div style="background-color:rgba(255,43,43,0.5); padding: 16px; border-radius: 8px;">
-                                🚧 Conflicts
-                                <pre style="margin:0; font-size: 1rem; background: none; border: none;">No conflicts found!</pre>
-                            </div>
-                            ''',
-                            unsafe_allow_html=True,
-                        )
-                        st.markdown("<br>", unsafe_allow_html=True)
+                        conflict_text = "No conflicts found!"
+                        conflict_opacity = 0.5
+                    result_html.append(
+                        f'<div style="background-color:rgba(255,43,43,{conflict_opacity}); padding: 16px; border-radius: 8px;">'
+                        f'🚧 Conflicts'
+                        f'<pre style="margin:0; font-size: 1rem; background: none; border: none;">{conflict_text}</pre>'
+                        f'</div><br>'
+                    )
                 
                 # Show success message using the calendar name from user input
-                st.markdown(
-                    f'''
-                    <div style="background-color:rgba(218,177,218,0.5); padding: 16px; border-radius: 8px; color: white;">
-                        🎉 Schedule has been saved to {calendar_name}!
-                    </div>
-                    ''',
-                    unsafe_allow_html=True,
+                result_html.append(
+                    f'<div style="background-color:rgba(218,177,218,0.5); padding: 16px; border-radius: 8px; color: white;">'
+                    f'🎉 Schedule has been saved to {calendar_name}!'
+                    f'</div>'
                 )
+                st.markdown("".join(result_html), unsafe_allow_html=True)
                     
             except subprocess.CalledProcessError as e:
                 st.error("❌ Scheduler failed!")
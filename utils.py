@@ -1,42 +1,162 @@
+import copy
+import hashlib
+import heapq
 import json
+import math
 import os
-import uuid
-from datetime import timedelta
-import pytz
+import stat
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from dateutil.parser import parse as parse_dt
-from dateutil.tz import tzutc
 from models import Member, Meeting
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Constants
 DATA_DIR = 'data'
 MEMBERS_FILE = os.path.join(DATA_DIR, 'members.json')
 MEETINGS_FILE = os.path.join(DATA_DIR, 'meetings.json')
 POTENTIAL_TIMES_FILE = os.path.join(DATA_DIR, 'potential_times.json')
 CONFIG_FILE = os.path.join(DATA_DIR, 'config.json')
+YAML_CACHE_DIR = os.path.join(DATA_DIR, '.cache')
+
+# Parsed YAML files by absolute path, with the (path, mtime, size) key they were read at
+_YAML_MEMO = {}
+
+# Parsed config.json with the (mtime, size) key it was read at
+_CONFIG_MEMO = {}
 
 # Ensure data directory exists
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # ===== File I/O Utilities =====
 
-def load_json(path):
-    """Load JSON data from a file."""
-    if not os.path.exists(path):
-        return []
-    with open(path, 'r') as f:
-        return json.load(f)
+def load_json(path, default=None):
+    """Load JSON data from a file, or return `default` (an empty list if not given) if it doesn't exist."""
+    # Open directly instead of checking existence first, saving a stat per load
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return [] if default is None else default
+    with f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    # orjson writes non-ASCII characters as UTF-8 rather than escaping them
+    return json.loads(data.decode('utf-8'))
+
+def _write_atomic(path, payload):
+    """Write bytes to a file through a temp file in the same directory, so readers never see a partial write."""
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+    # Open the temp file as 0666 so the kernel applies the umask, as it would for a plain open()
+    tmp_path = f'{path}.{os.urandom(8).hex()}.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        if mode is not None:
+            # Keep the permissions of the file being replaced
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
 
 def save_json(path, data):
-    """Save JSON data to a file."""
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+    """Save JSON data to a file, replacing it atomically."""
+    # Serialize up front so the file gets one write instead of one per token
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    _write_atomic(path, payload)
+
+def _yaml_key(path):
+    """Build the cache key for a YAML file from its absolute path, mtime and size."""
+    st = os.stat(path)
+    return [os.path.abspath(path), st.st_mtime_ns, st.st_size]
+
+def _yaml_cache_path(path):
+    """Get the path of the JSON copy of a YAML file under data/.cache."""
+    # Include a hash of the absolute path so same-named files in different directories get their own copies
+    path = os.path.abspath(path)
+    digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(YAML_CACHE_DIR, f"{os.path.basename(path)}.{digest}.json")
+
+def _json_native(value):
+    """Check whether a value comes back unchanged from a JSON round trip."""
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _json_native(v) for k, v in value.items())
+    if isinstance(value, list):
+        return all(_json_native(v) for v in value)
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return value is None or isinstance(value, (str, int))
+
+def _cache_yaml(key, data):
+    """Remember parsed YAML data in memory and, if JSON can hold it exactly, as a JSON copy under data/.cache."""
+    _YAML_MEMO[key[0]] = (key, data)
+    # Dates, timestamps and non-string keys would come back from JSON as strings, so don't cache those on disk
+    if not _json_native(data):
+        return
+    os.makedirs(YAML_CACHE_DIR, exist_ok=True)
+    try:
+        save_json(_yaml_cache_path(key[0]), {'key': key, 'data': data})
+    except TypeError:
+        # orjson can't encode integers wider than 64 bits; just skip caching
+        pass
+
+def _parse_yaml(path, key):
+    """Parse a YAML file, reusing a JSON copy under data/.cache made for the same key."""
+    cached = load_json(_yaml_cache_path(path), {})
+    if cached.get('key') == key:
+        return cached['data']
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=loader)
+    _cache_yaml(key, data)
+    return data
+
+def load_yaml(path):
+    """Load a YAML file, reparsing it only when its mtime or size changes."""
+    key = _yaml_key(path)
+    memo = _YAML_MEMO.get(key[0])
+    if memo is None or memo[0] != key:
+        memo = (key, _parse_yaml(path, key))
+        _YAML_MEMO[key[0]] = memo
+    # Callers may modify the result, so never hand out the cached object itself
+    return copy.deepcopy(memo[1])
+
+def save_yaml(path, data):
+    """Save data to a YAML file, using the LibYAML dumper when it is available."""
+    # Skip the dump and write when the file still holds exactly this data
+    memo = _YAML_MEMO.get(os.path.abspath(path))
+    if memo is not None and os.path.exists(path) and memo[0] == _yaml_key(path) and memo[1] == data:
+        return
+    import yaml
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    _write_atomic(path, yaml.dump(data, Dumper=dumper).encode('utf-8'))
+    # Cache what was written so the next load doesn't have to parse the YAML back
+    _cache_yaml(_yaml_key(path), copy.deepcopy(data))
+
+def generate_id():
+    """Return a random 32-character hex ID for a new record."""
+    # As random as uuid4 (which keeps 122 of its 128 bits random), without building a UUID object
+    return os.urandom(16).hex()
 
 # ===== Member Management =====
 
 def add_member(name, calendar_id):
     """Add a new member to the system."""
     members = load_json(MEMBERS_FILE)
-    member_id = str(uuid.uuid4())
+    member_id = generate_id()
     member = Member(id=member_id, name=name, calendar_id=calendar_id)
     members.append(member.__dict__)
     save_json(MEMBERS_FILE, members)
@@ -47,14 +167,17 @@ def list_members():
     members = load_json(MEMBERS_FILE)
     if not members:
         print('No members found.')
-    for m in members:
-        print(f"{m['id']}: {m['name']} (Calendar ID: {m['calendar_id']})")
+        return
+    # Build the listing and print it in one write rather than one per entry
+    print('\n'.join(f"{m['id']}: {m['name']} (Calendar ID: {m['calendar_id']})" for m in members))
 
 def remove_member(member_id):
     """Remove a member from the system."""
     members = load_json(MEMBERS_FILE)
     new_members = [m for m in members if m['id'] != member_id]
-    save_json(MEMBERS_FILE, new_members)
+    # Only rewrite the file if the member was actually there
+    if len(new_members) != len(members):
+        save_json(MEMBERS_FILE, new_members)
     print(f"Removed member with ID: {member_id}")
 
 # ===== Meeting Management =====
@@ -62,7 +185,7 @@ def remove_member(member_id):
 def add_meeting(name, member_ids, duration):
     """Add a new meeting to the system."""
     meetings = load_json(MEETINGS_FILE)
-    meeting_id = str(uuid.uuid4())
+    meeting_id = generate_id()
     meeting = Meeting(id=meeting_id, name=name, members=member_ids, duration=duration)
     meetings.append(meeting.__dict__)
     save_json(MEETINGS_FILE, meetings)
@@ -73,14 +196,15 @@ def list_meetings():
     meetings = load_json(MEETINGS_FILE)
     if not meetings:
         print('No meetings found.')
-    for m in meetings:
-        print(f"{m['id']}: {m['name']} (Members: {', '.join(m['members'])}, Duration: {m['duration']} min)")
+        return
+    print('\n'.join(f"{m['id']}: {m['name']} (Members: {', '.join(m['members'])}, Duration: {m['duration']} min)" for m in meetings))
 
 def remove_meeting(meeting_id):
     """Remove a meeting from the system."""
     meetings = load_json(MEETINGS_FILE)
     new_meetings = [m for m in meetings if m['id'] != meeting_id]
-    save_json(MEETINGS_FILE, new_meetings)
+    if len(new_meetings) != len(meetings):
+        save_json(MEETINGS_FILE, new_meetings)
     print(f"Removed meeting with ID: {meeting_id}")
 
 # ===== Potential Time Management =====
@@ -88,7 +212,7 @@ def remove_meeting(meeting_id):
 def add_potential_time(start_time, end_time):
     """Add a new potential meeting time to the system."""
     times = load_json(POTENTIAL_TIMES_FILE)
-    time_id = str(uuid.uuid4())
+    time_id = generate_id()
     entry = {
         'id': time_id,
         'start_time': start_time,
@@ -103,56 +227,64 @@ def list_potential_times():
     times = load_json(POTENTIAL_TIMES_FILE)
     if not times:
         print('No potential meeting times found.')
-    for t in times:
-        print(f"{t['id']}: {t['start_time']} to {t['end_time']}")
+        return
+    print('\n'.join(f"{t['id']}: {t['start_time']} to {t['end_time']}" for t in times))
 
 def remove_potential_time(time_id):
     """Remove a potential meeting time from the system."""
     times = load_json(POTENTIAL_TIMES_FILE)
     new_times = [t for t in times if t['id'] != time_id]
-    save_json(POTENTIAL_TIMES_FILE, new_times)
+    if len(new_times) != len(times):
+        save_json(POTENTIAL_TIMES_FILE, new_times)
     print(f"Removed potential time with ID: {time_id}")
 
 # ===== Configuration Management =====
 
+def _load_config():
+    """Load config.json, reparsing it only when its mtime or size changes, or False if it doesn't exist."""
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        return False
+    key = (st.st_mtime_ns, st.st_size)
+    if _CONFIG_MEMO.get('key') != key:
+        _CONFIG_MEMO['data'] = load_json(CONFIG_FILE, {})
+        _CONFIG_MEMO['key'] = key
+    return _CONFIG_MEMO['data']
+
+def _save_config(config):
+    """Write config.json and keep the cached copy in step with it."""
+    save_json(CONFIG_FILE, config)
+    st = os.stat(CONFIG_FILE)
+    _CONFIG_MEMO['data'] = config
+    _CONFIG_MEMO['key'] = (st.st_mtime_ns, st.st_size)
+
 def set_potential_times_calendar(calendar_id):
     """Set the potential meeting times calendar ID in configuration."""
-    config = {}
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-    config['potential_times_calendar_id'] = calendar_id
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    config = _load_config() or {}
+    # Leave config.json untouched when the value is already set
+    if config.get('potential_times_calendar_id') != calendar_id:
+        _save_config(dict(config, potential_times_calendar_id=calendar_id))
     print(f"Set potential meeting times calendar ID: {calendar_id}")
 
 def get_potential_times_calendar():
     """Get the potential meeting times calendar ID from configuration."""
-    if not os.path.exists(CONFIG_FILE):
+    config = _load_config()
+    if config is False:
         print('No potential meeting times calendar set.')
         return None
-    with open(CONFIG_FILE, 'r') as f:
-        config = json.load(f)
     return config.get('potential_times_calendar_id')
 
 def set_timezone(timezone):
     """Set the default timezone in configuration."""
-    config = {}
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-    config['timezone'] = timezone
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    config = _load_config() or {}
+    if config.get('timezone') != timezone:
+        _save_config(dict(config, timezone=timezone))
     print(f"Set default timezone: {timezone}")
 
 def get_timezone():
     """Get the default timezone from configuration."""
-    if not os.path.exists(CONFIG_FILE):
-        return 'America/New_York'
-    with open(CONFIG_FILE, 'r') as f:
-        config = json.load(f)
-    return config.get('timezone', 'America/New_York')
+    return (_load_config() or {}).get('timezone', 'America/New_York')
 
 # ===== Calendar Integration =====
 
@@ -162,82 +294,88 @@ def fetch_potential_times_from_calendar(service, week_start, week_end):
     if not calendar_id:
         print('No potential meeting times calendar set.')
         return []
-    events_result = service.events().list(
-        calendarId=calendar_id,
-        timeMin=week_start,
-        timeMax=week_end,
-        singleEvents=True,
-        orderBy='startTime'
-    ).execute()
-    events = events_result.get('items', [])
+    from calendar_service import iter_events
+    # Follow every page and ask only for the fields used below
+    fields = 'items(start(dateTime,date),end(dateTime,date),summary,location),nextPageToken'
     slots = []
-    for event in events:
+    for event in iter_events(service, calendar_id, week_start, week_end, fields):
         start = event['start'].get('dateTime', event['start'].get('date'))
         end = event['end'].get('dateTime', event['end'].get('date'))
         location = event.get('location')
         slots.append({'start_time': start, 'end_time': end, 'summary': event.get('summary', ''), 'location': location})
     return slots
 
-def fetch_member_conflicts(service, calendar_id, week_start, week_end):
-    """Fetch conflicts for a member from their Google Calendar."""
-    events_result = service.events().list(
-        calendarId=calendar_id,
-        timeMin=week_start,
-        timeMax=week_end,
-        singleEvents=True,
-        orderBy='startTime'
-    ).execute()
-    events = events_result.get('items', [])
-    conflicts = []
-    for event in events:
-        start = event['start'].get('dateTime', event['start'].get('date'))
-        end = event['end'].get('dateTime', event['end'].get('date'))
-        conflicts.append((start, end))
-    return conflicts
-
 # ===== Time and Scheduling Utilities =====
 
-def overlaps(slot_start, slot_end, conflict_start, conflict_end):
-    """Check if two time slots overlap."""
-    # All times are ISO strings
-    s1 = parse_dt(slot_start)
-    e1 = parse_dt(slot_end)
-    s2 = parse_dt(conflict_start)
-    e2 = parse_dt(conflict_end)
-    # Make all datetimes timezone-aware (UTC) if naive
-    if s1.tzinfo is None:
-        s1 = s1.replace(tzinfo=tzutc())
-    if e1.tzinfo is None:
-        e1 = e1.replace(tzinfo=tzutc())
-    if s2.tzinfo is None:
-        s2 = s2.replace(tzinfo=tzutc())
-    if e2.tzinfo is None:
-        e2 = e2.replace(tzinfo=tzutc())
-    return max(s1, s2) < min(e1, e2)
-
-def build_availability_matrix(members, slots, conflicts_by_member):
-    """Build a matrix showing which members are available for each time slot."""
-    matrix = {}
-    for i, slot in enumerate(slots):
-        slot_id = slot.get('id', str(i))
-        slot_start = slot['start_time']
-        slot_end = slot['end_time']
-        available = []
-        for member in members:
-            member_id = member['id']
-            conflicts = conflicts_by_member.get(member_id, [])
-            if not any(overlaps(slot_start, slot_end, c[0], c[1]) for c in conflicts):
-                available.append(member_id)
-        matrix[slot_id] = available
-    return matrix
+@lru_cache(maxsize=None)
+def to_epoch(value):
+    """Convert an ISO date or datetime string to integer epoch seconds (naive times are UTC)."""
+    dt = _parse_iso(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+def _parse_iso(value):
+    """Parse an ISO 8601 string with the stdlib parser, falling back to dateutil for anything it rejects."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return parse_dt(value)
+
+def merge_intervals(intervals):
+    """Merge (start, end) intervals into a start-sorted list of non-overlapping intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start < merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+def free_slot_indices(slots, busy, order=None):
+    """Yield the indices of (start, end) slots that overlap none of the busy intervals.
+
+    `order` lists the slot indices sorted by start time; pass it when checking the
+    same slots against many sets of busy intervals so they're sorted only once.
+    """
+    merged = merge_intervals(busy)
+    if order is None:
+        order = sorted(range(len(slots)), key=lambda i: slots[i][0])
+    j = 0
+    for i in order:
+        start, end = slots[i]
+        # Busy intervals ending by this start can't overlap this or any later slot
+        while j < len(merged) and merged[j][1] <= start:
+            j += 1
+        if j == len(merged) or merged[j][0] >= end:
+            yield i
+
+def overlap_cliques(intervals):
+    """Group (start, end, key) intervals into maximal sets of mutually overlapping keys."""
+    cliques = []
+    active = []
+    grew = False
+    for start, end, key in sorted(intervals, key=lambda iv: iv[0]):
+        if active and active[0][0] <= start:
+            # Everything active before this start overlaps; close that clique
+            if grew:
+                cliques.append([k for _, k in active])
+                grew = False
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+        heapq.heappush(active, (end, key))
+        grew = True
+    if grew:
+        cliques.append([k for _, k in active])
+    return cliques
 
 def generate_possible_slots(window_start, window_end, duration_minutes):
     """Generate possible meeting slots within a time window."""
     # window_start, window_end: ISO strings
     # Returns list of (slot_start, slot_end) ISO strings
-    s = parse_dt(window_start)
-    e = parse_dt(window_end)
-    slots = []
+    s = _parse_iso(window_start)
+    e = _parse_iso(window_end)
     # Round up to next half hour if needed
     minute = s.minute
     if minute not in (0, 30):
@@ -246,10 +384,12 @@ def generate_possible_slots(window_start, window_end, duration_minutes):
             s += timedelta(hours=1)
     else:
         s = s.replace(second=0, microsecond=0)
-    while s + timedelta(minutes=duration_minutes) <= e:
-        slot_start = s
-        slot_end = s + timedelta(minutes=duration_minutes)
-        slots.append((slot_start.isoformat(), slot_end.isoformat()))
-        # Increment by 30 minutes
-        s += timedelta(minutes=30)
+    step = timedelta(minutes=30)
+    duration = timedelta(minutes=duration_minutes)
+    # Count the half-hour starts that leave room for a full slot, instead of stepping and comparing each one
+    count = max((e - duration - s) // step + 1, 0)
+    slots = []
+    for k in range(count):
+        slot_start = s + k * step
+        slots.append((slot_start.isoformat(), (slot_start + duration).isoformat()))
     return slots 
\ No newline at end of file